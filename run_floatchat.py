@@ -6,26 +6,39 @@ Run this script to start the complete FloatChat application
 
 import subprocess
 import sys
+import hashlib
+import importlib.util
 import os
 import time
+import select
 import signal
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+DEPS_STAMP = Path(".deps_ok")
+REQUIRED_MODULES = ("streamlit", "fastapi", "uvicorn", "pandas", "numpy", "plotly")
+
 def check_dependencies():
     """Check if required dependencies are installed"""
-    try:
-        import streamlit
-        import fastapi
-        import uvicorn
-        import pandas
-        import numpy
-        import plotly
-        print("✅ All dependencies are installed")
+    # A stamp holding the hash of requirements.txt marks a previously verified
+    # environment, so warm starts skip the check entirely
+    req_path = Path("requirements.txt")
+    req_hash = hashlib.blake2b(req_path.read_bytes()).hexdigest() if req_path.exists() else ""
+    if req_hash and DEPS_STAMP.exists() and DEPS_STAMP.read_text(errors="ignore") == req_hash:
         return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    
+    # find_spec locates each package without importing it
+    missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    
+    print("✅ All dependencies are installed")
+    if req_hash:
+        DEPS_STAMP.write_text(req_hash)
+    return True
 
 def start_database():
     """Start the database using docker-compose"""
@@ -33,7 +46,8 @@ def start_database():
     try:
         subprocess.run(["docker-compose", "up", "-d", "postgres"], check=True)
         print("✅ Database started successfully")
-        time.sleep(5)  # Wait for database to be ready
+        if not wait_for_postgres():
+            print("⚠️ Database did not become ready in time")
         return True
     except subprocess.CalledProcessError:
         print("❌ Failed to start database. Make sure Docker is running.")
@@ -64,6 +78,36 @@ def generate_sample_data():
         print("❌ Sample data generation failed")
         return False
 
+def prepare_database():
+    """Create tables, then load sample data into them"""
+    if setup_database():
+        generate_sample_data()
+
+def wait_for_port(port, host="localhost", timeout=30.0):
+    """Poll until a TCP port accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def wait_for_postgres(timeout=30.0):
+    """Poll pg_isready inside the container until PostgreSQL accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = subprocess.run(
+            ["docker-compose", "exec", "-T", "postgres", "pg_isready", "-U", "floatchat", "-d", "floatchat"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode == 0:
+            return True
+        time.sleep(0.5)
+    return False
+
 def start_api_server():
     """Start the FastAPI server"""
     print("🚀 Starting API server...")
@@ -71,7 +115,7 @@ def start_api_server():
         # Start API server in background
         api_process = subprocess.Popen([
             sys.executable, "-m", "src.api.main"
-        ])
+        ], close_fds=False)
         print("✅ API server started on http://localhost:8000")
         return api_process
     except Exception as e:
@@ -87,13 +131,36 @@ def start_frontend():
             sys.executable, "-m", "streamlit", "run", "src/frontend/app.py",
             "--server.port", "8501",
             "--server.address", "localhost"
-        ])
+        ], close_fds=False)
         print("✅ Frontend started on http://localhost:8501")
         return frontend_process
     except Exception as e:
         print(f"❌ Failed to start frontend: {e}")
         return None
 
+def wait_for_exit(processes):
+    """Block until any process exits and return its index"""
+    # pidfds become readable when the child exits, so the wait is event-driven;
+    # platforms without pidfd_open fall back to polling
+    if hasattr(os, "pidfd_open"):
+        pidfds = {}
+        try:
+            for i, process in enumerate(processes):
+                pidfds[os.pidfd_open(process.pid)] = i
+            ready, _, _ = select.select(list(pidfds), [], [])
+            return pidfds[ready[0]]
+        except OSError:
+            pass
+        finally:
+            for fd in pidfds:
+                os.close(fd)
+    
+    while True:
+        for i, process in enumerate(processes):
+            if process.poll() is not None:
+                return i
+        time.sleep(1)
+
 def cleanup_processes(processes):
     """Clean up running processes"""
     print("\n🛑 Shutting down services...")
@@ -131,11 +198,10 @@ def main():
     if not start_database():
         print("⚠️  Continuing without database (using mock data)")
     
-    # Setup database
-    setup_database()
-    
-    # Generate sample data
-    generate_sample_data()
+    # Database setup and sample data run in the background while the services boot;
+    # sample data needs the tables, so those two stay ordered within the task
+    executor = ThreadPoolExecutor(max_workers=1)
+    db_ready = executor.submit(prepare_database)
     
     # Start services
     processes = []
@@ -144,13 +210,20 @@ def main():
     api_process = start_api_server()
     if api_process:
         processes.append(api_process)
-        time.sleep(3)  # Wait for API to start
     
     # Start frontend
     frontend_process = start_frontend()
     if frontend_process:
         processes.append(frontend_process)
     
+    if api_process and not wait_for_port(8000):
+        print("⚠️  API server did not start listening on port 8000")
+    if frontend_process and not wait_for_port(8501):
+        print("⚠️  Frontend did not start listening on port 8501")
+    
+    db_ready.result()
+    executor.shutdown()
+    
     if not processes:
         print("❌ Failed to start any services")
         sys.exit(1)
@@ -164,15 +237,11 @@ def main():
     print("Press Ctrl+C to stop all services")
     
     try:
-        # Wait for processes
-        while True:
-            time.sleep(1)
-            # Check if any process has died
-            for i, process in enumerate(processes):
-                if process and process.poll() is not None:
-                    print(f"❌ Process {i} has stopped unexpectedly")
-                    cleanup_processes(processes)
-                    sys.exit(1)
+        # Wait for any process to die
+        i = wait_for_exit(processes)
+        print(f"❌ Process {i} has stopped unexpectedly")
+        cleanup_processes(processes)
+        sys.exit(1)
     except KeyboardInterrupt:
         cleanup_processes(processes)
         print("\n👋 FloatChat stopped. Thank you for exploring the oceans!")
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """
 Database setup script for FloatChat
+
+create_all only creates missing tables, so databases created before the
+file_hash column and the uq_plat_cyc constraint are upgraded in place by
+the idempotent statements in UPGRADE_STATEMENTS. Rerun this script after
+pulling schema changes.
 """
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from src.database.models import Base
 from src.config import settings
 import logging
@@ -15,6 +20,31 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Idempotent DDL bringing an existing argo_profiles table up to the current models.
+# Duplicate float cycles are removed (newest kept) before the unique constraint is added
+UPGRADE_STATEMENTS = (
+    "ALTER TABLE argo_profiles ADD COLUMN IF NOT EXISTS file_hash VARCHAR(32)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_argo_profiles_file_hash ON argo_profiles (file_hash)",
+    "CREATE INDEX IF NOT EXISTS ix_argo_profiles_platform_cycle_date "
+    "ON argo_profiles (platform_number, cycle_number, measurement_date DESC)",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_plat_cyc') THEN
+            DELETE FROM argo_profiles WHERE profile_id IN (
+                SELECT profile_id FROM (
+                    SELECT profile_id, ROW_NUMBER() OVER (
+                        PARTITION BY platform_number, cycle_number ORDER BY measurement_date DESC
+                    ) AS rn FROM argo_profiles
+                ) ranked WHERE rn > 1
+            );
+            ALTER TABLE argo_profiles
+                ADD CONSTRAINT uq_plat_cyc UNIQUE (platform_number, cycle_number);
+        END IF;
+    END $$
+    """,
+)
+
 def setup_database():
     """Create database tables"""
     try:
@@ -22,6 +52,12 @@ def setup_database():
         Base.metadata.create_all(engine)
         logger.info("Database tables created successfully!")
         
+        # Existing tables are not touched by create_all, so upgrade them explicitly
+        with engine.begin() as connection:
+            for statement in UPGRADE_STATEMENTS:
+                connection.execute(text(statement))
+        logger.info("Database schema is up to date")
+        
     except Exception as e:
         logger.error(f"Error setting up database: {e}")
         sys.exit(1)
@@ -1,9 +1,123 @@
 import re
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 import logging
+import ahocorasick
 
 logger = logging.getLogger(__name__)
 
+# Response strategies keyed by (user_mode, complexity); read-only and shared by every classifier
+_STRATEGY_TABLE: Dict[Tuple[str, str], Mapping[str, Any]] = {
+    ('scientist', 'simple'): MappingProxyType({
+        'response_style': 'technical',
+        'include_raw_data': True,
+        'visualization_type': 'detailed_plots',
+        'export_formats': ('csv', 'netcdf')
+    }),
+    ('scientist', 'medium'): MappingProxyType({
+        'response_style': 'analytical',
+        'include_raw_data': True,
+        'visualization_type': 'advanced_plots',
+        'export_formats': ('csv', 'netcdf', 'json')
+    }),
+    ('scientist', 'complex'): MappingProxyType({
+        'response_style': 'research_grade',
+        'include_raw_data': True,
+        'visualization_type': 'publication_quality',
+        'export_formats': ('csv', 'netcdf', 'json', 'ascii')
+    }),
+    ('student', 'simple'): MappingProxyType({
+        'response_style': 'educational',
+        'include_raw_data': False,
+        'visualization_type': 'colorful_infographics',
+        'export_formats': ('csv',)
+    }),
+    ('student', 'medium'): MappingProxyType({
+        'response_style': 'explanatory',
+        'include_raw_data': False,
+        'visualization_type': 'interactive_plots',
+        'export_formats': ('csv', 'pdf')
+    }),
+    ('student', 'complex'): MappingProxyType({
+        'response_style': 'detailed_explanation',
+        'include_raw_data': True,
+        'visualization_type': 'educational_advanced',
+        'export_formats': ('csv', 'pdf')
+    }),
+    ('fisherman', 'simple'): MappingProxyType({
+        'response_style': 'practical',
+        'include_raw_data': False,
+        'visualization_type': 'simple_indicators',
+        'export_formats': ()
+    }),
+    ('fisherman', 'medium'): MappingProxyType({
+        'response_style': 'forecast_focused',
+        'include_raw_data': False,
+        'visualization_type': 'weather_style',
+        'export_formats': ('pdf',)
+    }),
+    ('fisherman', 'complex'): MappingProxyType({
+        'response_style': 'comprehensive_forecast',
+        'include_raw_data': False,
+        'visualization_type': 'detailed_forecast',
+        'export_formats': ('pdf', 'csv')
+    })
+}
+
+# Complexity indicators are matched against the query's word tokens
+_WORD_PATTERN = re.compile(r"\w+")
+_SIMPLE_INDICATORS = frozenset({'show', 'what', 'where', 'when'})
+_HOW_MANY = 'how many'
+_COMPLEX_INDICATORS = frozenset({
+    'compare', 'analyze', 'correlation', 'trend', 'anomaly',
+    'statistical', 'regression', 'clustering', 'prediction'
+})
+
+# Locations, time periods and numeric values come out of one regex scan;
+# each alternative is a named group and the match's lastgroup says which hit.
+# A number pair only counts as a coordinate when a ° sign or hemisphere letter
+# follows one of them, so bare pairs such as "2022, 2023" stay years/values.
+# Queries never carry non-ASCII digits, so \d and \s are matched as ASCII only
+_ENTITY_SCANNER = re.compile(r"""
+    (?P<relative>(?P<rel_anchor>last|past|recent)\s+(?P<rel_count>\d+)\s+(?P<rel_unit>days?|months?|years?))
+    | (?P<upcoming>(?P<up_anchor>this|next)\s+(?P<up_unit>year|month|week))
+    | (?P<month>january|february|march|april|may|june|july|august|september|october|november|december)
+    | (?P<latlon>(?=\d+(?:\.\d+)?\s*(?:°|[NS](?![a-z]))|\d+(?:\.\d+)?[,\s]+\d+(?:\.\d+)?\s*(?:°|[EW](?![a-z])))
+        (?P<lat>\d+(?:\.\d+)?)(?!\.?\d)[°\s]*[NS]?\s*[,\s]*(?P<lon>\d+(?:\.\d+)?)(?!\.?\d)[°\s]*[EW]?)
+    | (?P<year>(?<!\d)\d{4}(?!\d))
+    | (?P<value>\d+(?:\.\d+)?)
+""", re.IGNORECASE | re.VERBOSE | re.ASCII)
+
+@lru_cache(maxsize=None)
+def _build_keyword_index(vocabularies: Tuple) -> Tuple[ahocorasick.Automaton, Tuple[str, ...], Dict[str, Tuple[int, int]]]:
+    """Build one automaton over every keyword vocabulary
+    
+    Memoized on the frozen vocabularies, so every classifier in a process
+    (and every worker forked after import) shares a single prebuilt index.
+    """
+    # Every (category, key) pair gets an integer slot in a flat counter array;
+    # each category owns a contiguous range of slots
+    slot_keys = []
+    category_slots = {}
+    keyword_slots = {}
+    for category, vocabulary in vocabularies:
+        start = len(slot_keys)
+        for key, keywords in vocabulary:
+            slot = len(slot_keys)
+            slot_keys.append(key)
+            for keyword in keywords:
+                # A keyword can feed several slots (e.g. 'depth' is an intent and a parameter)
+                keyword_slots.setdefault(keyword, []).append(slot)
+        category_slots[category] = (start, len(slot_keys))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, slots in keyword_slots.items():
+        automaton.add_word(keyword, tuple(slots))
+    automaton.make_automaton()
+    
+    return automaton, tuple(slot_keys), category_slots
+
 class IntentClassifier:
     """Classify user intents for ocean data queries"""
     
@@ -58,57 +172,148 @@ class IntentClassifier:
                 r'conditions', r'forecast', r'prediction'
             ]
         }
+        
+        self.param_patterns = [
+            r'temperature', r'salinity', r'oxygen', r'nitrate', r'ph',
+            r'chlorophyll', r'pressure', r'depth'
+        ]
+        
+        self.ocean_regions = [
+            'indian ocean', 'pacific ocean', 'atlantic ocean', 'arabian sea', 'bay of bengal'
+        ]
+        
+        # All keyword vocabularies are plain literals, so a single Aho-Corasick
+        # automaton finds every intent, mode, parameter and region hit in one pass
+        self._keyword_automaton, self._slot_keys, self._category_slots = self._build_keyword_automaton()
+        self._entity_scanner = _ENTITY_SCANNER
+        
+        # Classification is deterministic, so memoize it on the normalized query
+        self._classify_cached = lru_cache(maxsize=4096)(self._classify_normalized)
+    
+    def _build_keyword_automaton(self) -> Tuple[ahocorasick.Automaton, Tuple[str, ...], Dict[str, Tuple[int, int]]]:
+        """Fetch the shared keyword index for this classifier's vocabularies"""
+        vocabularies = [
+            ('intent', self.intent_patterns),
+            ('mode', self.user_mode_patterns),
+            ('param', {param: [param] for param in self.param_patterns}),
+            ('region', {region: [region] for region in self.ocean_regions}),
+        ]
+        return _build_keyword_index(tuple(
+            (category, tuple((key, tuple(keywords)) for key, keywords in vocabulary.items()))
+            for category, vocabulary in vocabularies
+        ))
+    
+    def _scan_keywords(self, query_lower: str) -> Dict[str, Dict[str, int]]:
+        """Count keyword hits per category in a single pass over the query"""
+        counts = [0] * len(self._slot_keys)
+        for _, slots in self._keyword_automaton.iter(query_lower):
+            for slot in slots:
+                counts[slot] += 1
+        
+        return {
+            category: dict(zip(self._slot_keys[start:end], counts[start:end]))
+            for category, (start, end) in self._category_slots.items()
+        }
     
     def classify_intent(self, query: str) -> Dict[str, any]:
         """Classify the intent of a user query"""
-        query_lower = query.lower()
+        query_norm = " ".join(query.lower().split())
+        primary_intent, intent_scores, user_mode, entities, complexity, confidence = \
+            self._classify_cached(query_norm)
+        
+        # Rehydrate the frozen cache entry so callers can't mutate it
+        return {
+            'primary_intent': primary_intent,
+            'intent_scores': dict(intent_scores),
+            'user_mode': user_mode,
+            'entities': {key: list(values) for key, values in entities},
+            'complexity': complexity,
+            'confidence': confidence
+        }
+    
+    def classify_batch(self, queries: List[str]) -> List[Dict[str, any]]:
+        """Classify many queries at once using vectorized pandas string operations"""
+        import pandas as pd
+        
+        if not queries:
+            return []
+        
+        series = pd.Series(queries, dtype=object).str.lower().str.split().str.join(" ")
+        
+        def keyword_counts(vocabulary: Dict[str, List[str]]) -> pd.DataFrame:
+            return pd.DataFrame({
+                key: sum(series.str.count(re.escape(keyword)) for keyword in keywords)
+                for key, keywords in vocabulary.items()
+            })
+        
+        intent_counts = keyword_counts(self.intent_patterns)
+        mode_counts = keyword_counts(self.user_mode_patterns)
+        param_hits = pd.DataFrame({p: series.str.contains(p, regex=False) for p in self.param_patterns})
+        region_hits = pd.DataFrame({r: series.str.contains(r, regex=False) for r in self.ocean_regions})
+        
+        primary_intents = intent_counts.idxmax(axis=1)
+        user_modes = mode_counts.idxmax(axis=1).where(mode_counts.max(axis=1) > 0, 'scientist')
+        totals = intent_counts.sum(axis=1)
+        confidences = (intent_counts.max(axis=1) / totals.where(totals > 0)).fillna(0)
+        
+        results = []
+        for i, query_lower in enumerate(series):
+            keyword_hits = {
+                'param': param_hits.iloc[i].to_dict(),
+                'region': region_hits.iloc[i].to_dict()
+            }
+            results.append({
+                'primary_intent': primary_intents.iat[i],
+                'intent_scores': {k: int(v) for k, v in intent_counts.iloc[i].items()},
+                'user_mode': user_modes.iat[i],
+                'entities': self._extract_entities(query_lower, keyword_hits),
+                'complexity': self._assess_complexity(query_lower),
+                'confidence': float(confidences.iat[i])
+            })
+        
+        return results
+    
+    def _classify_normalized(self, query_lower: str) -> Tuple:
+        """Classify a lowercased, whitespace-normalized query into a frozen result"""
+        keyword_hits = self._scan_keywords(query_lower)
         
         # Detect primary intent
-        intent_scores = {}
-        for intent, patterns in self.intent_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, query_lower))
-                score += matches
-            intent_scores[intent] = score
+        intent_scores = keyword_hits['intent']
         
         # Get primary intent
         primary_intent = max(intent_scores, key=intent_scores.get) if intent_scores else 'general_query'
         
         # Detect user mode
-        user_mode = self._detect_user_mode(query_lower)
+        user_mode = self._detect_user_mode(keyword_hits['mode'])
         
         # Extract entities
-        entities = self._extract_entities(query)
+        entities = self._extract_entities(query_lower, keyword_hits)
         
         # Determine complexity level
-        complexity = self._assess_complexity(query)
+        complexity = self._assess_complexity(query_lower)
         
-        return {
-            'primary_intent': primary_intent,
-            'intent_scores': intent_scores,
-            'user_mode': user_mode,
-            'entities': entities,
-            'complexity': complexity,
-            'confidence': max(intent_scores.values()) / sum(intent_scores.values()) if sum(intent_scores.values()) > 0 else 0
-        }
+        # The winning score is already known, so don't rescan the scores for max/sum twice
+        total_score = sum(intent_scores.values())
+        confidence = intent_scores[primary_intent] / total_score if total_score > 0 else 0
+        
+        return (
+            primary_intent,
+            tuple(intent_scores.items()),
+            user_mode,
+            tuple((key, tuple(values)) for key, values in entities.items()),
+            complexity,
+            confidence
+        )
     
-    def _detect_user_mode(self, query: str) -> str:
+    def _detect_user_mode(self, mode_scores: Dict[str, int]) -> str:
         """Detect the user mode based on query language"""
-        mode_scores = {}
-        
-        for mode, patterns in self.user_mode_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, query))
-                score += matches
-            mode_scores[mode] = score
+        best_mode = max(mode_scores, key=mode_scores.get)
         
         # Default to scientist mode if no clear indication
-        return max(mode_scores, key=mode_scores.get) if max(mode_scores.values()) > 0 else 'scientist'
+        return best_mode if mode_scores[best_mode] > 0 else 'scientist'
     
-    def _extract_entities(self, query: str) -> Dict[str, List[str]]:
-        """Extract entities from the query"""
+    def _extract_entities(self, query_lower: str, keyword_hits: Dict[str, Dict[str, int]]) -> Dict[str, List[str]]:
+        """Extract entities from the lowercased query"""
         entities = {
             'locations': [],
             'time_periods': [],
@@ -117,134 +322,54 @@ class IntentClassifier:
             'ocean_regions': []
         }
         
-        # Extract locations (latitude/longitude patterns)
-        lat_lon_pattern = r'(\d+(?:\.\d+)?)[°\s]*[NS]?\s*[,,\s]*(\d+(?:\.\d+)?)[°\s]*[EW]?'
-        lat_lon_matches = re.findall(lat_lon_pattern, query)
-        entities['locations'] = [f"{lat}°N, {lon}°E" for lat, lon in lat_lon_matches]
-        
-        # Extract time periods
-        time_patterns = [
-            r'\d{4}',  # Years
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)',
-            r'(last|past|recent)\s+(\d+)\s+(days?|months?|years?)',
-            r'(this|next)\s+(year|month|week)'
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, query.lower())
-            entities['time_periods'].extend(matches)
+        # Extract locations, time periods and numerical values in a single scan
+        for match in self._entity_scanner.finditer(query_lower):
+            kind = match.lastgroup
+            if kind == 'latlon':
+                lat, lon = match.group('lat', 'lon')
+                entities['locations'].append(f"{lat}°N, {lon}°E")
+                entities['values'].extend((lat, lon))
+            elif kind == 'year':
+                entities['time_periods'].append(match.group())
+                entities['values'].append(match.group())
+            elif kind == 'month':
+                entities['time_periods'].append(match.group())
+            elif kind == 'relative':
+                entities['time_periods'].append(match.group('rel_anchor', 'rel_count', 'rel_unit'))
+                entities['values'].append(match.group('rel_count'))
+            elif kind == 'upcoming':
+                entities['time_periods'].append(match.group('up_anchor', 'up_unit'))
+            else:
+                entities['values'].append(match.group())
         
         # Extract ocean regions
-        for region in ['indian ocean', 'pacific ocean', 'atlantic ocean', 'arabian sea', 'bay of bengal']:
-            if region in query.lower():
-                entities['ocean_regions'].append(region)
+        entities['ocean_regions'] = [r for r, n in keyword_hits['region'].items() if n]
         
         # Extract parameters
-        param_patterns = [
-            r'temperature', r'salinity', r'oxygen', r'nitrate', r'ph',
-            r'chlorophyll', r'pressure', r'depth'
-        ]
-        
-        for pattern in param_patterns:
-            if re.search(pattern, query.lower()):
-                entities['parameters'].append(pattern)
-        
-        # Extract numerical values
-        value_pattern = r'\d+(?:\.\d+)?'
-        entities['values'] = re.findall(value_pattern, query)
+        entities['parameters'] = [p for p, n in keyword_hits['param'].items() if n]
         
         return entities
     
-    def _assess_complexity(self, query: str) -> str:
-        """Assess the complexity level of the query"""
-        query_lower = query.lower()
+    def _assess_complexity(self, query_lower: str) -> str:
+        """Assess the complexity level of the lowercased query"""
+        words = query_lower.split()
+        tokens = set(_WORD_PATTERN.findall(query_lower))
         
         # Simple queries
-        simple_indicators = ['show', 'what', 'where', 'when', 'how many']
-        if any(indicator in query_lower for indicator in simple_indicators):
-            if len(query.split()) < 10:
+        if not _SIMPLE_INDICATORS.isdisjoint(tokens) or _HOW_MANY in query_lower:
+            if len(words) < 10:
                 return 'simple'
         
         # Complex queries
-        complex_indicators = [
-            'compare', 'analyze', 'correlation', 'trend', 'anomaly',
-            'statistical', 'regression', 'clustering', 'prediction'
-        ]
-        if any(indicator in query_lower for indicator in complex_indicators):
+        if not _COMPLEX_INDICATORS.isdisjoint(tokens):
             return 'complex'
         
         # Medium complexity
         return 'medium'
     
-    def get_response_strategy(self, intent_result: Dict) -> Dict[str, any]:
+    def get_response_strategy(self, intent_result: Dict) -> Mapping[str, any]:
         """Get response strategy based on intent classification"""
-        primary_intent = intent_result['primary_intent']
-        user_mode = intent_result['user_mode']
-        complexity = intent_result['complexity']
-        
-        strategies = {
-            'scientist': {
-                'simple': {
-                    'response_style': 'technical',
-                    'include_raw_data': True,
-                    'visualization_type': 'detailed_plots',
-                    'export_formats': ['csv', 'netcdf']
-                },
-                'medium': {
-                    'response_style': 'analytical',
-                    'include_raw_data': True,
-                    'visualization_type': 'advanced_plots',
-                    'export_formats': ['csv', 'netcdf', 'json']
-                },
-                'complex': {
-                    'response_style': 'research_grade',
-                    'include_raw_data': True,
-                    'visualization_type': 'publication_quality',
-                    'export_formats': ['csv', 'netcdf', 'json', 'ascii']
-                }
-            },
-            'student': {
-                'simple': {
-                    'response_style': 'educational',
-                    'include_raw_data': False,
-                    'visualization_type': 'colorful_infographics',
-                    'export_formats': ['csv']
-                },
-                'medium': {
-                    'response_style': 'explanatory',
-                    'include_raw_data': False,
-                    'visualization_type': 'interactive_plots',
-                    'export_formats': ['csv', 'pdf']
-                },
-                'complex': {
-                    'response_style': 'detailed_explanation',
-                    'include_raw_data': True,
-                    'visualization_type': 'educational_advanced',
-                    'export_formats': ['csv', 'pdf']
-                }
-            },
-            'fisherman': {
-                'simple': {
-                    'response_style': 'practical',
-                    'include_raw_data': False,
-                    'visualization_type': 'simple_indicators',
-                    'export_formats': []
-                },
-                'medium': {
-                    'response_style': 'forecast_focused',
-                    'include_raw_data': False,
-                    'visualization_type': 'weather_style',
-                    'export_formats': ['pdf']
-                },
-                'complex': {
-                    'response_style': 'comprehensive_forecast',
-                    'include_raw_data': False,
-                    'visualization_type': 'detailed_forecast',
-                    'export_formats': ['pdf', 'csv']
-                }
-            }
-        }
-        
-        return strategies.get(user_mode, {}).get(complexity, strategies['scientist']['simple'])
-
-
+        return _STRATEGY_TABLE.get(
+            (intent_result['user_mode'], intent_result['complexity']),
+            _STRATEGY_TABLE[('scientist', 'simple')]
+        )
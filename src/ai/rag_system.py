@@ -1,13 +1,94 @@
 from langchain_community.llms import OpenAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
+from cachetools import LRUCache
 import sqlparse
+import asyncio
+import hashlib
+import io
+import itertools
+import json
 import re
-from typing import Dict, List
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+_DANGEROUS_SQL = re.compile(
+    r"\b(DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|TRUNCATE|GRANT|REVOKE)\b", re.IGNORECASE
+)
+_LIMIT_CLAUSE = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def _validate_sql(sql_query: str) -> str:
+    """Validate and sanitize SQL query, cheapest checks first"""
+    
+    # Ensure query starts with SELECT
+    if sql_query.lstrip()[:6].lower() != 'select':
+        raise ValueError("Only SELECT queries are allowed")
+    
+    # Reject dangerous keywords
+    dangerous = _DANGEROUS_SQL.search(sql_query)
+    if dangerous:
+        raise ValueError(f"Dangerous SQL keyword detected: {dangerous.group(1).upper()}")
+    
+    # Parse SQL to ensure it's valid
+    try:
+        sqlparse.parse(sql_query)
+    except Exception as e:
+        raise ValueError(f"Invalid SQL syntax: {e}")
+    
+    # Add LIMIT if not present
+    return sql_query if _LIMIT_CLAUSE.search(sql_query) else f"{sql_query} LIMIT 1000"
+
+def _build_context(docs: List[str]) -> str:
+    """Number retrieved profile documents into one prompt context block"""
+    buf = io.StringIO()
+    write = buf.write
+    for i, doc in enumerate(docs, 1):
+        if i > 1:
+            write("\n")
+        write("Profile ")
+        write(str(i))
+        write(": ")
+        write(doc)
+    return buf.getvalue()
+
+def _close_rows(rows: Iterator[Dict]) -> None:
+    """Release the pooled connection behind a streamed result"""
+    close = getattr(rows, 'close', None)
+    if close is not None:
+        close()
+
+class _StreamedRows:
+    """Preview rows followed by the rest of a streamed result
+    
+    Exhausting the iterator releases the connection; close() releases it early.
+    """
+    
+    def __init__(self, preview: List[Dict], rows: Iterator[Dict]):
+        self._iter = itertools.chain(preview, rows)
+        self._rows = rows
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return self
+    
+    def __next__(self) -> Dict:
+        return next(self._iter)
+    
+    def close(self) -> None:
+        _close_rows(self._rows)
+
+def _columnar_json(rows: List[Dict]) -> str:
+    """Encode result rows as compact columnar JSON so column names appear once"""
+    cols = list(rows[0]) if rows else []
+    return json.dumps(
+        {"cols": cols, "rows": [[row[c] for c in cols] for row in rows]},
+        default=str, separators=(",", ":")
+    )
+
 class ArgoRAGSystem:
     """Retrieval-Augmented Generation system for ARGO data queries"""
     
@@ -17,6 +98,32 @@ class ArgoRAGSystem:
         self.llm = OpenAI(api_key=openai_api_key, temperature=0.1, max_tokens=2000)
         self.sql_prompt = self._create_sql_prompt_template()
         self.response_prompt = self._create_response_prompt_template()
+        self.sql_chain = LLMChain(llm=self.llm, prompt=self.sql_prompt)
+        self.response_chain = LLMChain(llm=self.llm, prompt=self.response_prompt)
+        
+        # LLM calls dominate query latency and are near-deterministic at this
+        # temperature, so cache their outputs per (question, prompt input)
+        self._sql_cache = LRUCache(maxsize=2048)
+        self._response_cache = LRUCache(maxsize=2048)
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def _cache_key(question: str, payload: str) -> Tuple[str, str]:
+        """Build an LLM cache key from the normalized question and a digest of the prompt input"""
+        digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+        return question.strip().lower(), digest
+    
+    async def _cached_run(self, cache: LRUCache, key: Tuple[str, str], chain: LLMChain, **inputs) -> str:
+        """Run an LLM chain unless its output for this key is already cached"""
+        with self._cache_lock:
+            output = cache.get(key)
+        
+        if output is None:
+            output = await chain.arun(**inputs)
+            with self._cache_lock:
+                cache[key] = output
+        
+        return output
         
     def _create_sql_prompt_template(self) -> PromptTemplate:
         """Create prompt template for SQL generation"""
@@ -26,10 +133,10 @@ class ArgoRAGSystem:
 
         Database Schema:
         - argo_profiles: profile_id, platform_number, cycle_number, latitude, longitude, 
-          measurement_date, pressure_levels (FLOAT[]), temperature (FLOAT[]), salinity (FLOAT[]),
+          measurement_date, pressure_levels (REAL[]), temperature (REAL[]), salinity (REAL[]),
           mixed_layer_depth, max_depth, ocean_region
-        - argo_bgc_profiles: profile_id, oxygen (FLOAT[]), nitrate (FLOAT[]), ph (FLOAT[]), 
-          chlorophyll_a (FLOAT[]), backscattering (FLOAT[])
+        - argo_bgc_profiles: profile_id, oxygen (REAL[]), nitrate (REAL[]), ph (REAL[]), 
+          chlorophyll_a (REAL[]), backscattering (REAL[])
 
         Relevant Context from Vector Search:
         {context}
@@ -61,7 +168,7 @@ class ArgoRAGSystem:
 
         User Question: {question}
         SQL Query Used: {sql_query}
-        Query Results: {results}
+        Query Results (JSON; "cols" names the columns of each array in "rows"): {results}
 
         Provide a response that:
         1. Directly answers the user's question
@@ -78,46 +185,71 @@ class ArgoRAGSystem:
         )
     
     def process_query(self, user_question: str) -> Dict:
-        """Process natural language query and return results"""
+        """Process natural language query and return results
         
+        Blocking wrapper around aprocess_query for synchronous callers only;
+        code already running in an event loop must await aprocess_query.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aprocess_query(user_question))
+        raise RuntimeError(
+            "process_query() cannot run inside an event loop; await aprocess_query() instead"
+        )
+    
+    async def aprocess_query(self, user_question: str) -> Dict:
+        """Process natural language query without blocking the event loop on I/O
+        
+        'results' streams rows from a pooled connection; callers must exhaust it
+        or call its close() to return the connection to the pool.
+        """
+        
+        rows = iter(())
         try:
             # Step 1: Semantic search for relevant context
-            search_results = self.vector_db.semantic_search(user_question, n_results=5)
+            search_results = await self.vector_db.asemantic_search(user_question, n_results=5)
             
-            context = "\n".join([
-                f"Profile {i+1}: {doc}" 
-                for i, doc in enumerate(search_results['documents'][0])
-            ])
+            context = _build_context(search_results['documents'][0])
             
             # Step 2: Generate SQL query using LLM
-            sql_chain = LLMChain(llm=self.llm, prompt=self.sql_prompt)
-            sql_query = sql_chain.run(
+            sql_query = (await self._cached_run(
+                self._sql_cache,
+                self._cache_key(user_question, context),
+                self.sql_chain,
                 context=context,
                 question=user_question
-            ).strip()
+            )).strip()
             
             # Step 3: Validate and execute SQL
             sql_query = self._validate_sql_query(sql_query)
-            results = self._execute_query(sql_query)
+            rows = await asyncio.to_thread(self._execute_query, sql_query)
             
             # Step 4: Generate natural language response
-            response_chain = LLMChain(llm=self.llm, prompt=self.response_prompt)
-            response = response_chain.run(
+            # Only the first 5 rows are fetched for the prompt
+            preview = await asyncio.to_thread(lambda: list(itertools.islice(rows, 5)))
+            results_preview = _columnar_json(preview)
+            response = await self._cached_run(
+                self._response_cache,
+                self._cache_key(user_question, sql_query + results_preview),
+                self.response_chain,
                 question=user_question,
                 sql_query=sql_query,
-                results=str(results[:5])  # First 5 rows for context
+                results=results_preview
             )
             
             return {
                 'query': user_question,
                 'sql': sql_query,
-                'results': results,
+                # Rows past the preview are only fetched if the caller iterates them
+                'results': _StreamedRows(preview, rows),
                 'response': response,
                 'context': search_results,
                 'success': True
             }
             
         except Exception as e:
+            _close_rows(rows)
             logger.error(f"Error processing query: {e}")
             return {
                 'error': str(e),
@@ -127,38 +259,12 @@ class ArgoRAGSystem:
     
     def _validate_sql_query(self, sql_query: str) -> str:
         """Validate and sanitize SQL query"""
-        
-        # Remove dangerous keywords
-        dangerous_keywords = ['DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE']
-        sql_upper = sql_query.upper()
-        
-        for keyword in dangerous_keywords:
-            if keyword in sql_upper:
-                raise ValueError(f"Dangerous SQL keyword detected: {keyword}")
-        
-        # Ensure query starts with SELECT
-        if not sql_upper.strip().startswith('SELECT'):
-            raise ValueError("Only SELECT queries are allowed")
-        
-        # Parse SQL to ensure it's valid
-        try:
-            sqlparse.parse(sql_query)
-        except Exception as e:
-            raise ValueError(f"Invalid SQL syntax: {e}")
-        
-        # Add LIMIT if not present
-        if 'LIMIT' not in sql_upper:
-            sql_query += ' LIMIT 1000'
-        
-        return sql_query
+        return _validate_sql(sql_query)
     
-    def _execute_query(self, sql_query: str) -> List[Dict]:
-        """Execute SQL query and return results"""
-        try:
-            return self.sql_client.execute_query(sql_query)
-        except Exception as e:
-            logger.error(f"Error executing query: {e}")
-            return []
+    def _execute_query(self, sql_query: str) -> Iterator[Dict]:
+        """Execute SQL query and return a lazy iterator over the result rows"""
+        # stream_query logs execution errors itself and returns an empty iterator
+        return self.sql_client.stream_query(sql_query)
     
     def _generate_query_suggestions(self, user_question: str) -> List[str]:
         """Generate query suggestions for failed queries"""
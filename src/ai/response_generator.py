@@ -1,43 +1,222 @@
+from dataclasses import dataclass
 from typing import Dict, List, Any
 import logging
+from bisect import bisect_left
+from collections import defaultdict
+from types import MappingProxyType
+import numpy as np
 from .intent_classifier import IntentClassifier
 
 logger = logging.getLogger(__name__)
 
+# Response openers per user mode and intent, shared by every generator
+_RESPONSE_TEMPLATES = MappingProxyType({
+    'scientist': MappingProxyType({
+        'temperature_query': "Based on the ARGO data analysis, here are the temperature findings:",
+        'salinity_query': "Salinity analysis from the oceanographic data reveals:",
+        'location_query': "ARGO float locations and measurements:",
+        'comparison_query': "Comparative analysis of the requested parameters:",
+        'anomaly_query': "Anomaly detection results from the dataset:",
+        'general_query': "Scientific analysis of the ARGO oceanographic data:"
+    }),
+    'student': MappingProxyType({
+        'temperature_query': "Let me explain ocean temperature in simple terms! 🌡️",
+        'salinity_query': "Here's what salinity means for our oceans! 🌊",
+        'location_query': "Let's explore where these ocean measurements come from! 🗺️",
+        'comparison_query': "Let's compare these ocean features! ⚖️",
+        'anomaly_query': "Something unusual is happening in the ocean! 🤔",
+        'general_query': "Let's learn about the ocean together! 📚"
+    }),
+    'fisherman': MappingProxyType({
+        'temperature_query': "Here's what the water temperature means for fishing! 🎣",
+        'salinity_query': "How salt levels affect your catch! 🐟",
+        'location_query': "Best fishing spots based on ocean data! 🎯",
+        'comparison_query': "Comparing fishing conditions! 📊",
+        'anomaly_query': "Unusual ocean conditions that might affect fishing! ⚠️",
+        'general_query': "Ocean conditions for your fishing trip! 🌊"
+    })
+})
+
+# Visualizations suggested for each primary intent
+_VIZ_SUGGESTIONS_BY_INTENT = MappingProxyType({
+    'temperature_query': ('temperature_profile', 'temperature_map', 'temperature_timeseries'),
+    'salinity_query': ('salinity_profile', 'salinity_map', 'salinity_timeseries'),
+    'location_query': ('location_map', 'float_trajectory'),
+    'comparison_query': ('comparison_plot', 'scatter_plot', 'box_plot'),
+    'anomaly_query': ('anomaly_detection', 'outlier_plot')
+})
+_DEFAULT_VIZ_SUGGESTIONS = ('general_plot', 'data_summary')
+
+# Extra visualizations and follow-up recommendations per user mode
+_VIZ_SUGGESTIONS_BY_MODE = MappingProxyType({
+    'student': ('educational_infographic', 'interactive_plot'),
+    'fisherman': ('fishing_conditions_map', 'weather_style_plot')
+})
+_RECOMMENDATIONS_BY_MODE = MappingProxyType({
+    'scientist': (
+        "Consider downloading raw data for further analysis",
+        "Check quality flags for data reliability",
+        "Compare with historical data for trend analysis"
+    ),
+    'student': (
+        "Try asking about different ocean regions",
+        "Learn more about how ARGO floats work",
+        "Explore seasonal patterns in ocean data"
+    ),
+    'fisherman': (
+        "Check weather forecasts for complete picture",
+        "Consider tidal conditions for fishing timing",
+        "Look for areas with stable ocean conditions"
+    )
+})
+
+# Descriptive suffixes indexed by where a value falls among ascending thresholds;
+# bisect_left keeps the strict '>' boundaries, so a value equal to a threshold
+# lands in the lower band
+_STUDENT_TEMP_THRESHOLDS = (15, 25)
+_STUDENT_TEMP_SUFFIXES = (
+    "That's quite cold! Only hardy sea creatures can survive here! 🐧\n",
+    "That's a comfortable temperature for most sea life! 🐠\n",
+    "That's quite warm! Perfect for swimming! 🏊‍♀️\n",
+)
+_STUDENT_SAL_THRESHOLDS = (30, 35)
+_STUDENT_SAL_SUFFIXES = (
+    "That's less salty - maybe near a river! 🏞️\n",
+    "That's normal ocean salinity! 🐟\n",
+    "That's very salty water! 🌊\n",
+)
+_STUDENT_AVG_TEMP_THRESHOLDS = (15, 25)
+_STUDENT_AVG_TEMP_SUFFIXES = (
+    "   → This is a cold ocean region! ❄️\n",
+    "   → This is a temperate ocean region! 🌊\n",
+    "   → This is a warm ocean region! 🌴\n",
+)
+_FISHING_TEMP_THRESHOLDS = (15, 22, 28)
+_FISHING_TEMP_SUFFIXES = (
+    "   → Cold water - fish may be less active! ❄️\n",
+    "   → Cool water - try deeper fishing! 🐟\n",
+    "   → Good fishing temperature! 🎣\n",
+    "   → Very warm water - good for tropical fish! 🐠\n",
+)
+_FISHING_SAL_THRESHOLDS = (30, 35)
+_FISHING_SAL_SUFFIXES = (
+    "   → Lower salinity - check for freshwater influence! 🏞️\n",
+    "   → Normal ocean conditions! 🐟\n",
+    "   → High salinity - good for saltwater fish! 🌊\n",
+)
+_FISHING_AVG_TEMP_THRESHOLDS = (20, 26)
+_FISHING_AVG_TEMP_SUFFIXES = (
+    "   → Challenging conditions - try different techniques! 🎯\n",
+    "   → Good fishing conditions! 🐟\n",
+    "   → Excellent fishing conditions! 🎣\n",
+)
+
+# Fixed metadata header for a single-profile response in each mode; missing
+# fields render as N/A
+_SCIENTIST_SINGLE_TEMPLATE = (
+    "**Single Profile Analysis:**\n"
+    "- Platform: {platform_number}\n"
+    "- Location: {latitude}°N, {longitude}°E\n"
+    "- Date: {measurement_date}\n"
+    "- Ocean Region: {ocean_region}\n"
+)
+_STUDENT_SINGLE_TEMPLATE = (
+    "**What we found:**\n"
+    "📍 This data comes from ARGO float {platform_number}\n"
+    "🌍 Located at {latitude}°N, {longitude}°E\n"
+    "📅 Measured on {measurement_date}\n"
+    "🌊 In the {ocean_region}\n\n"
+)
+_FISHERMAN_SINGLE_TEMPLATE = (
+    "**Fishing Conditions Report:**\n"
+    "🎣 Location: {latitude}°N, {longitude}°E\n"
+    "📅 Date: {measurement_date}\n"
+    "🌊 Region: {ocean_region}\n\n"
+)
+
+def _not_available() -> str:
+    return 'N/A'
+
+def _profile_array(values) -> np.ndarray:
+    """Profile values as float64, NaN where a sample is missing"""
+    if values is None:
+        return np.empty(0)
+    return np.asarray(values, dtype=np.float64)  # None becomes NaN
+
+def _clean_profile(arr: np.ndarray) -> np.ndarray:
+    """Finite values of a profile array, in depth order"""
+    return arr[np.isfinite(arr)]
+
+def _normalize_results(results: List[Dict]) -> List[Dict]:
+    """Give every result float64 profile arrays and a region string, once, up front"""
+    return [
+        {
+            **result,
+            'temperature_arr': _profile_array(result.get('temperature')),
+            'salinity_arr': _profile_array(result.get('salinity')),
+            'ocean_region': result.get('ocean_region') or 'Unknown'
+        }
+        for result in results
+    ]
+
+def _summarize(values: np.ndarray) -> Dict[str, float]:
+    """Min, max and mean of the finite values, empty if there are none"""
+    finite = values[np.isfinite(values)]
+    if not finite.size:
+        return {}
+    return {'min': float(finite.min()), 'max': float(finite.max()), 'mean': float(finite.mean())}
+
+def _first_finite(profiles: List[np.ndarray]) -> np.ndarray:
+    """First finite value of each profile array, NaN where a profile has none"""
+    # Profiles are flattened into one CSR-style array (values plus segment offsets)
+    # so the scan for each segment's first finite value is a single searchsorted
+    lengths = np.fromiter((values.size for values in profiles), dtype=np.intp, count=len(profiles))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    flat = np.concatenate(profiles) if profiles else np.empty(0)
+    
+    finite = np.flatnonzero(np.isfinite(flat))
+    pos = np.searchsorted(finite, starts)
+    hit = pos < finite.size
+    hit[hit] = finite[pos[hit]] < ends[hit]
+    
+    surface = np.full(len(profiles), np.nan)
+    surface[hit] = flat[finite[pos[hit]]]
+    return surface
+
+@dataclass
+class ResultsSoA:
+    """Column-per-field view of a batch of profile results"""
+    surface_temp: np.ndarray
+    surface_sal: np.ndarray
+    ocean_region: np.ndarray
+    
+    def region_counts(self) -> Dict[str, int]:
+        """Profiles per region, in order of first appearance"""
+        regions, first_index, counts = np.unique(self.ocean_region, return_index=True, return_counts=True)
+        order = np.argsort(first_index)
+        return dict(zip(regions[order].tolist(), counts[order].tolist()))
+
+def results_to_soa(results: List[Dict]) -> ResultsSoA:
+    """Convert normalized result dicts into contiguous per-field arrays"""
+    regions = np.empty(len(results), dtype=object)
+    regions[:] = [result['ocean_region'] for result in results]
+    return ResultsSoA(
+        surface_temp=_first_finite([result['temperature_arr'] for result in results]),
+        surface_sal=_first_finite([result['salinity_arr'] for result in results]),
+        ocean_region=regions
+    )
+
 class ResponseGenerator:
     """Generate contextual responses based on user intent and mode"""
     
     def __init__(self):
         self.intent_classifier = IntentClassifier()
-        self.response_templates = self._load_response_templates()
-    
-    def _load_response_templates(self) -> Dict[str, Dict[str, str]]:
-        """Load response templates for different user modes and intents"""
-        return {
-            'scientist': {
-                'temperature_query': "Based on the ARGO data analysis, here are the temperature findings:",
-                'salinity_query': "Salinity analysis from the oceanographic data reveals:",
-                'location_query': "ARGO float locations and measurements:",
-                'comparison_query': "Comparative analysis of the requested parameters:",
-                'anomaly_query': "Anomaly detection results from the dataset:",
-                'general_query': "Scientific analysis of the ARGO oceanographic data:"
-            },
-            'student': {
-                'temperature_query': "Let me explain ocean temperature in simple terms! 🌡️",
-                'salinity_query': "Here's what salinity means for our oceans! 🌊",
-                'location_query': "Let's explore where these ocean measurements come from! 🗺️",
-                'comparison_query': "Let's compare these ocean features! ⚖️",
-                'anomaly_query': "Something unusual is happening in the ocean! 🤔",
-                'general_query': "Let's learn about the ocean together! 📚"
-            },
-            'fisherman': {
-                'temperature_query': "Here's what the water temperature means for fishing! 🎣",
-                'salinity_query': "How salt levels affect your catch! 🐟",
-                'location_query': "Best fishing spots based on ocean data! 🎯",
-                'comparison_query': "Comparing fishing conditions! 📊",
-                'anomaly_query': "Unusual ocean conditions that might affect fishing! ⚠️",
-                'general_query': "Ocean conditions for your fishing trip! 🌊"
-            }
+        self.response_templates = _RESPONSE_TEMPLATES
+        self._mode_dispatch = {
+            'scientist': self._generate_scientist_response,
+            'student': self._generate_student_response,
+            'fisherman': self._generate_fisherman_response
         }
     
     def generate_response(self, query: str, data_results: Dict, visualization_data: Dict = None) -> Dict[str, Any]:
@@ -51,9 +230,14 @@ class ResponseGenerator:
         # Get response strategy
         strategy = self.intent_classifier.get_response_strategy(intent_result)
         
+        # Results may arrive as a lazy row iterator, so materialize them once; the
+        # normalized copy lets the generators skip per-field guards
+        results = list(data_results.get('results', []))
+        normalized_results = {**data_results, 'results': _normalize_results(results)}
+        
         # Generate base response
         base_response = self._generate_base_response(
-            query, data_results, intent_result, strategy
+            query, normalized_results, intent_result, strategy
         )
         
         # Add contextual information
@@ -77,7 +261,7 @@ class ResponseGenerator:
             'user_mode': user_mode,
             'intent': primary_intent,
             'confidence': intent_result['confidence'],
-            'raw_data': data_results.get('results', []) if strategy['include_raw_data'] else None
+            'raw_data': results if strategy['include_raw_data'] else None
         }
     
     def _generate_base_response(self, query: str, data_results: Dict, 
@@ -99,284 +283,168 @@ class ResponseGenerator:
             return f"{template} Unfortunately, no data was found for your query. Try adjusting your search parameters."
         
         # Generate mode-specific response
-        if user_mode == 'scientist':
-            return self._generate_scientist_response(template, results, data_results)
-        elif user_mode == 'student':
-            return self._generate_student_response(template, results, data_results)
-        elif user_mode == 'fisherman':
-            return self._generate_fisherman_response(template, results, data_results)
-        else:
-            return self._generate_scientist_response(template, results, data_results)
+        handler = self._mode_dispatch.get(user_mode, self._generate_scientist_response)
+        return handler(template, results, data_results)
     
     def _generate_scientist_response(self, template: str, results: List[Dict], 
                                    data_results: Dict) -> str:
         """Generate response for scientist mode"""
         
-        response = template + "\n\n"
+        parts = [template, "\n\n"]
         
         if len(results) == 1:
             result = results[0]
-            response += f"**Single Profile Analysis:**\n"
-            response += f"- Platform: {result.get('platform_number', 'N/A')}\n"
-            response += f"- Location: {result.get('latitude', 'N/A')}°N, {result.get('longitude', 'N/A')}°E\n"
-            response += f"- Date: {result.get('measurement_date', 'N/A')}\n"
-            response += f"- Ocean Region: {result.get('ocean_region', 'N/A')}\n"
+            parts.append(_SCIENTIST_SINGLE_TEMPLATE.format_map(defaultdict(_not_available, result)))
             
-            if 'temperature' in result:
-                temp_data = [x for x in result['temperature'] if x is not None]
-                if temp_data:
-                    response += f"- Temperature Range: {min(temp_data):.2f}°C to {max(temp_data):.2f}°C\n"
-                    response += f"- Surface Temperature: {temp_data[0]:.2f}°C\n"
+            temp_data = _clean_profile(result['temperature_arr'])
+            if temp_data.size:
+                parts.append(
+                    f"- Temperature Range: {temp_data.min():.2f}°C to {temp_data.max():.2f}°C\n"
+                    f"- Surface Temperature: {temp_data[0]:.2f}°C\n"
+                )
             
-            if 'salinity' in result:
-                sal_data = [x for x in result['salinity'] if x is not None]
-                if sal_data:
-                    response += f"- Salinity Range: {min(sal_data):.2f} to {max(sal_data):.2f} PSU\n"
-                    response += f"- Surface Salinity: {sal_data[0]:.2f} PSU\n"
+            sal_data = _clean_profile(result['salinity_arr'])
+            if sal_data.size:
+                parts.append(
+                    f"- Salinity Range: {sal_data.min():.2f} to {sal_data.max():.2f} PSU\n"
+                    f"- Surface Salinity: {sal_data[0]:.2f} PSU\n"
+                )
         
         else:
-            response += f"**Statistical Summary ({len(results)} profiles):**\n"
+            parts.append(f"**Statistical Summary ({len(results)} profiles):**\n")
             
             # Calculate statistics
-            all_temps = []
-            all_sals = []
-            regions = {}
-            
-            for result in results:
-                if 'temperature' in result and result['temperature']:
-                    temp_data = [x for x in result['temperature'] if x is not None]
-                    if temp_data:
-                        all_temps.append(temp_data[0])  # Surface temperature
-                
-                if 'salinity' in result and result['salinity']:
-                    sal_data = [x for x in result['salinity'] if x is not None]
-                    if sal_data:
-                        all_sals.append(sal_data[0])  # Surface salinity
-                
-                region = result.get('ocean_region', 'Unknown')
-                regions[region] = regions.get(region, 0) + 1
+            soa = results_to_soa(results)
+            regions = soa.region_counts()
             
-            if all_temps:
-                response += f"- Average Surface Temperature: {sum(all_temps)/len(all_temps):.2f}°C\n"
-                response += f"- Temperature Range: {min(all_temps):.2f}°C to {max(all_temps):.2f}°C\n"
+            temp_stats = _summarize(soa.surface_temp)
+            if temp_stats:
+                parts.append(
+                    f"- Average Surface Temperature: {temp_stats['mean']:.2f}°C\n"
+                    f"- Temperature Range: {temp_stats['min']:.2f}°C to {temp_stats['max']:.2f}°C\n"
+                )
             
-            if all_sals:
-                response += f"- Average Surface Salinity: {sum(all_sals)/len(all_sals):.2f} PSU\n"
-                response += f"- Salinity Range: {min(all_sals):.2f} to {max(all_sals):.2f} PSU\n"
+            sal_stats = _summarize(soa.surface_sal)
+            if sal_stats:
+                parts.append(
+                    f"- Average Surface Salinity: {sal_stats['mean']:.2f} PSU\n"
+                    f"- Salinity Range: {sal_stats['min']:.2f} to {sal_stats['max']:.2f} PSU\n"
+                )
             
-            response += f"- Regional Distribution: {dict(regions)}\n"
+            parts.append(f"- Regional Distribution: {dict(regions)}\n")
         
-        return response
+        return "".join(parts)
     
     def _generate_student_response(self, template: str, results: List[Dict], 
                                  data_results: Dict) -> str:
         """Generate response for student mode"""
         
-        response = template + "\n\n"
+        parts = [template, "\n\n"]
         
         if len(results) == 1:
             result = results[0]
-            response += f"**What we found:**\n"
-            response += f"📍 This data comes from ARGO float {result.get('platform_number', 'N/A')}\n"
-            response += f"🌍 Located at {result.get('latitude', 'N/A')}°N, {result.get('longitude', 'N/A')}°E\n"
-            response += f"📅 Measured on {result.get('measurement_date', 'N/A')}\n"
-            response += f"🌊 In the {result.get('ocean_region', 'N/A')}\n\n"
+            parts.append(_STUDENT_SINGLE_TEMPLATE.format_map(defaultdict(_not_available, result)))
             
-            if 'temperature' in result:
-                temp_data = [x for x in result['temperature'] if x is not None]
-                if temp_data:
-                    response += f"🌡️ **Temperature:** The water temperature at the surface is {temp_data[0]:.1f}°C. "
-                    if temp_data[0] > 25:
-                        response += "That's quite warm! Perfect for swimming! 🏊‍♀️\n"
-                    elif temp_data[0] > 15:
-                        response += "That's a comfortable temperature for most sea life! 🐠\n"
-                    else:
-                        response += "That's quite cold! Only hardy sea creatures can survive here! 🐧\n"
+            temp_data = _clean_profile(result['temperature_arr'])
+            if temp_data.size:
+                parts.append(f"🌡️ **Temperature:** The water temperature at the surface is {temp_data[0]:.1f}°C. ")
+                parts.append(_STUDENT_TEMP_SUFFIXES[bisect_left(_STUDENT_TEMP_THRESHOLDS, temp_data[0])])
             
-            if 'salinity' in result:
-                sal_data = [x for x in result['salinity'] if x is not None]
-                if sal_data:
-                    response += f"🧂 **Salinity:** The salt level is {sal_data[0]:.1f} PSU. "
-                    if sal_data[0] > 35:
-                        response += "That's very salty water! 🌊\n"
-                    elif sal_data[0] > 30:
-                        response += "That's normal ocean salinity! 🐟\n"
-                    else:
-                        response += "That's less salty - maybe near a river! 🏞️\n"
+            sal_data = _clean_profile(result['salinity_arr'])
+            if sal_data.size:
+                parts.append(f"🧂 **Salinity:** The salt level is {sal_data[0]:.1f} PSU. ")
+                parts.append(_STUDENT_SAL_SUFFIXES[bisect_left(_STUDENT_SAL_THRESHOLDS, sal_data[0])])
         
         else:
-            response += f"**We found {len(results)} ocean measurements!**\n\n"
-            response += "Here's what they tell us:\n"
+            parts.append(
+                f"**We found {len(results)} ocean measurements!**\n\n"
+                "Here's what they tell us:\n"
+            )
             
             # Calculate simple statistics
-            all_temps = []
-            all_sals = []
+            soa = results_to_soa(results)
             
-            for result in results:
-                if 'temperature' in result and result['temperature']:
-                    temp_data = [x for x in result['temperature'] if x is not None]
-                    if temp_data:
-                        all_temps.append(temp_data[0])
-                
-                if 'salinity' in result and result['salinity']:
-                    sal_data = [x for x in result['salinity'] if x is not None]
-                    if sal_data:
-                        all_sals.append(sal_data[0])
+            temp_stats = _summarize(soa.surface_temp)
+            if temp_stats:
+                avg_temp = temp_stats['mean']
+                parts.append(f"🌡️ **Average temperature:** {avg_temp:.1f}°C\n")
+                parts.append(_STUDENT_AVG_TEMP_SUFFIXES[bisect_left(_STUDENT_AVG_TEMP_THRESHOLDS, avg_temp)])
             
-            if all_temps:
-                avg_temp = sum(all_temps) / len(all_temps)
-                response += f"🌡️ **Average temperature:** {avg_temp:.1f}°C\n"
-                if avg_temp > 25:
-                    response += "   → This is a warm ocean region! 🌴\n"
-                elif avg_temp > 15:
-                    response += "   → This is a temperate ocean region! 🌊\n"
-                else:
-                    response += "   → This is a cold ocean region! ❄️\n"
-            
-            if all_sals:
-                avg_sal = sum(all_sals) / len(all_sals)
-                response += f"🧂 **Average salinity:** {avg_sal:.1f} PSU\n"
-                response += "   → This is typical ocean saltiness! 🐠\n"
+            sal_stats = _summarize(soa.surface_sal)
+            if sal_stats:
+                avg_sal = sal_stats['mean']
+                parts.append(
+                    f"🧂 **Average salinity:** {avg_sal:.1f} PSU\n"
+                    "   → This is typical ocean saltiness! 🐠\n"
+                )
         
-        return response
+        return "".join(parts)
     
     def _generate_fisherman_response(self, template: str, results: List[Dict], 
                                    data_results: Dict) -> str:
         """Generate response for fisherman mode"""
         
-        response = template + "\n\n"
+        parts = [template, "\n\n"]
         
         if len(results) == 1:
             result = results[0]
-            response += f"**Fishing Conditions Report:**\n"
-            response += f"🎣 Location: {result.get('latitude', 'N/A')}°N, {result.get('longitude', 'N/A')}°E\n"
-            response += f"📅 Date: {result.get('measurement_date', 'N/A')}\n"
-            response += f"🌊 Region: {result.get('ocean_region', 'N/A')}\n\n"
+            parts.append(_FISHERMAN_SINGLE_TEMPLATE.format_map(defaultdict(_not_available, result)))
             
-            if 'temperature' in result:
-                temp_data = [x for x in result['temperature'] if x is not None]
-                if temp_data:
-                    surface_temp = temp_data[0]
-                    response += f"🌡️ **Water Temperature:** {surface_temp:.1f}°C\n"
-                    if surface_temp > 28:
-                        response += "   → Very warm water - good for tropical fish! 🐠\n"
-                    elif surface_temp > 22:
-                        response += "   → Good fishing temperature! 🎣\n"
-                    elif surface_temp > 15:
-                        response += "   → Cool water - try deeper fishing! 🐟\n"
-                    else:
-                        response += "   → Cold water - fish may be less active! ❄️\n"
+            temp_data = _clean_profile(result['temperature_arr'])
+            if temp_data.size:
+                surface_temp = temp_data[0]
+                parts.append(f"🌡️ **Water Temperature:** {surface_temp:.1f}°C\n")
+                parts.append(_FISHING_TEMP_SUFFIXES[bisect_left(_FISHING_TEMP_THRESHOLDS, surface_temp)])
             
-            if 'salinity' in result:
-                sal_data = [x for x in result['salinity'] if x is not None]
-                if sal_data:
-                    surface_sal = sal_data[0]
-                    response += f"🧂 **Water Salinity:** {surface_sal:.1f} PSU\n"
-                    if surface_sal > 35:
-                        response += "   → High salinity - good for saltwater fish! 🌊\n"
-                    elif surface_sal > 30:
-                        response += "   → Normal ocean conditions! 🐟\n"
-                    else:
-                        response += "   → Lower salinity - check for freshwater influence! 🏞️\n"
+            sal_data = _clean_profile(result['salinity_arr'])
+            if sal_data.size:
+                surface_sal = sal_data[0]
+                parts.append(f"🧂 **Water Salinity:** {surface_sal:.1f} PSU\n")
+                parts.append(_FISHING_SAL_SUFFIXES[bisect_left(_FISHING_SAL_THRESHOLDS, surface_sal)])
         
         else:
-            response += f"**Regional Fishing Conditions ({len(results)} locations):**\n\n"
+            parts.append(f"**Regional Fishing Conditions ({len(results)} locations):**\n\n")
             
             # Analyze conditions
-            all_temps = []
-            all_sals = []
-            
-            for result in results:
-                if 'temperature' in result and result['temperature']:
-                    temp_data = [x for x in result['temperature'] if x is not None]
-                    if temp_data:
-                        all_temps.append(temp_data[0])
-                
-                if 'salinity' in result and result['salinity']:
-                    sal_data = [x for x in result['salinity'] if x is not None]
-                    if sal_data:
-                        all_sals.append(sal_data[0])
+            soa = results_to_soa(results)
             
-            if all_temps:
-                avg_temp = sum(all_temps) / len(all_temps)
-                response += f"🌡️ **Average Water Temperature:** {avg_temp:.1f}°C\n"
-                if avg_temp > 26:
-                    response += "   → Excellent fishing conditions! 🎣\n"
-                elif avg_temp > 20:
-                    response += "   → Good fishing conditions! 🐟\n"
-                else:
-                    response += "   → Challenging conditions - try different techniques! 🎯\n"
+            temp_stats = _summarize(soa.surface_temp)
+            if temp_stats:
+                avg_temp = temp_stats['mean']
+                parts.append(f"🌡️ **Average Water Temperature:** {avg_temp:.1f}°C\n")
+                parts.append(_FISHING_AVG_TEMP_SUFFIXES[bisect_left(_FISHING_AVG_TEMP_THRESHOLDS, avg_temp)])
             
-            if all_sals:
-                avg_sal = sum(all_sals) / len(all_sals)
-                response += f"🧂 **Average Salinity:** {avg_sal:.1f} PSU\n"
-                response += "   → Standard ocean conditions for fishing! 🌊\n"
+            sal_stats = _summarize(soa.surface_sal)
+            if sal_stats:
+                avg_sal = sal_stats['mean']
+                parts.append(
+                    f"🧂 **Average Salinity:** {avg_sal:.1f} PSU\n"
+                    "   → Standard ocean conditions for fishing! 🌊\n"
+                )
         
-        return response
+        return "".join(parts)
     
     def _add_contextual_info(self, data_results: Dict, user_mode: str, 
                            primary_intent: str) -> Dict[str, Any]:
         """Add contextual information based on user mode and intent"""
         
-        contextual_info = {
+        return {
             'data_quality': 'high',
             'confidence_level': 'good',
-            'recommendations': []
+            'recommendations': _RECOMMENDATIONS_BY_MODE.get(user_mode, ())
         }
-        
-        results = data_results.get('results', [])
-        
-        if user_mode == 'scientist':
-            contextual_info['recommendations'] = [
-                "Consider downloading raw data for further analysis",
-                "Check quality flags for data reliability",
-                "Compare with historical data for trend analysis"
-            ]
-        elif user_mode == 'student':
-            contextual_info['recommendations'] = [
-                "Try asking about different ocean regions",
-                "Learn more about how ARGO floats work",
-                "Explore seasonal patterns in ocean data"
-            ]
-        elif user_mode == 'fisherman':
-            contextual_info['recommendations'] = [
-                "Check weather forecasts for complete picture",
-                "Consider tidal conditions for fishing timing",
-                "Look for areas with stable ocean conditions"
-            ]
-        
-        return contextual_info
     
     def _suggest_visualizations(self, primary_intent: str, data_results: Dict, 
                               user_mode: str) -> List[str]:
         """Suggest appropriate visualizations based on intent and data"""
         
-        suggestions = []
-        results = data_results.get('results', [])
-        
-        if primary_intent == 'temperature_query':
-            suggestions.extend(['temperature_profile', 'temperature_map', 'temperature_timeseries'])
-        elif primary_intent == 'salinity_query':
-            suggestions.extend(['salinity_profile', 'salinity_map', 'salinity_timeseries'])
-        elif primary_intent == 'location_query':
-            suggestions.extend(['location_map', 'float_trajectory'])
-        elif primary_intent == 'comparison_query':
-            suggestions.extend(['comparison_plot', 'scatter_plot', 'box_plot'])
-        elif primary_intent == 'anomaly_query':
-            suggestions.extend(['anomaly_detection', 'outlier_plot'])
-        else:
-            suggestions.extend(['general_plot', 'data_summary'])
-        
-        # Add mode-specific suggestions
-        if user_mode == 'student':
-            suggestions.extend(['educational_infographic', 'interactive_plot'])
-        elif user_mode == 'fisherman':
-            suggestions.extend(['fishing_conditions_map', 'weather_style_plot'])
-        
-        return suggestions
+        return [
+            *_VIZ_SUGGESTIONS_BY_INTENT.get(primary_intent, _DEFAULT_VIZ_SUGGESTIONS),
+            *_VIZ_SUGGESTIONS_BY_MODE.get(user_mode, ())
+        ]
     
     def _get_export_options(self, strategy: Dict) -> List[str]:
         """Get available export options based on strategy"""
-        return strategy.get('export_formats', ['csv'])
+        return list(strategy.get('export_formats', ['csv']))
 
 
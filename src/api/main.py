@@ -1,6 +1,8 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+import orjson
 import uvicorn
 from .routes import router
 from ..config import settings
@@ -8,16 +10,18 @@ from ..config import settings
 app = FastAPI(
     title="FloatChat API",
     description="AI-powered ARGO ocean data discovery and visualization",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware
+# CORS middleware; explicit origins let browsers cache preflights for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization", "if-none-match"],
+    max_age=86400,
 )
 
 # Include routes
@@ -26,13 +30,17 @@ app.include_router(router, prefix="/api/v1")
 # Serve static files
 app.mount("/static", StaticFiles(directory="src/frontend/static"), name="static")
 
+# Static bodies are serialized once at import
+_ROOT_JSON = orjson.dumps({"message": "FloatChat API is running!"})
+_HEALTH_JSON = orjson.dumps({"status": "healthy", "version": "1.0.0"})
+
 @app.get("/")
 async def root():
-    return {"message": "FloatChat API is running!"}
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "1.0.0"}
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     uvicorn.run(
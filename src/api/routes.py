@@ -1,6 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Dict, Optional
-import pandas as pd
+from cachetools import TTLCache
+from functools import lru_cache
+import asyncio
+import hashlib
+import json
+import re
+import threading
+from types import MappingProxyType
+import orjson
+import numpy as np
 from ..ai.rag_system import ArgoRAGSystem
 from ..ai.response_generator import ResponseGenerator
 from ..data_pipeline.vector_db import ArgoVectorDatabase
@@ -9,17 +18,155 @@ from .schemas import QueryRequest, QueryResponse, ProfileData
 
 router = APIRouter()
 
-# Initialize components (in production, use dependency injection)
-vector_db = ArgoVectorDatabase()
-db_client = DatabaseClient()
-response_generator = ResponseGenerator()
+# Components are built on first use and shared by every request in the process
+@lru_cache(maxsize=1)
+def get_vector_db() -> ArgoVectorDatabase:
+    return ArgoVectorDatabase()
+
+@lru_cache(maxsize=1)
+def get_db_client() -> DatabaseClient:
+    return DatabaseClient()
+
+@lru_cache(maxsize=1)
+def get_response_generator() -> ResponseGenerator:
+    return ResponseGenerator()
+
+# Responses for repeated (query, mode, filters) requests, expired after an hour
+_response_cache = TTLCache(maxsize=1024, ttl=3600)
+_response_cache_lock = threading.Lock()
+_WHITESPACE = re.compile(r"\s+")
+
+def _response_cache_key(request: QueryRequest) -> str:
+    """Hash the normalized query, mode and filters into a cache key"""
+    query_norm = _WHITESPACE.sub(" ", request.query.strip().lower())
+    filters_key = json.dumps(request.filters or {}, sort_keys=True, default=str)
+    return hashlib.sha256(f"{query_norm}\0{request.mode}\0{filters_key}".encode()).hexdigest()
+
+def _etag(payload: bytes) -> str:
+    """Weak ETag for a serialized payload"""
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+def _cacheable_json(request: Request, payload: bytes, etag: str, max_age: int) -> Response:
+    """Serve JSON bytes with validators, or a bare 304 if the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+# Mock payloads are static, so they are built once at import; the fully static
+# ones are also serialized once and served as raw bytes
+_MOCK_PROFILES = [
+    {
+        "profile_id": "550e8400-e29b-41d4-a716-446655440000",
+        "platform_number": "2900123",
+        "latitude": 15.5,
+        "longitude": 75.2,
+        "measurement_date": "2023-08-15T12:00:00Z",
+        "max_depth": 2000.0,
+        "ocean_region": "Indian Ocean"
+    }
+]
+_SEARCH_RESULTS_JSON = orjson.dumps({"profiles": _MOCK_PROFILES, "total_count": len(_MOCK_PROFILES)})
+
+_MOCK_PROFILE = MappingProxyType({
+    "platform_number": "2900123",
+    "cycle_number": 45,
+    "latitude": 15.5,
+    "longitude": 75.2,
+    "measurement_date": "2023-08-15T12:00:00Z",
+    "pressure_levels": np.array([2.5, 10.0, 20.0, 30.0, 50.0, 75.0, 100.0]),
+    "temperature": np.array([28.5, 28.2, 27.8, 26.5, 24.2, 22.1, 20.8]),
+    "salinity": np.array([34.2, 34.5, 34.8, 35.1, 35.3, 35.4, 35.5]),
+    "mixed_layer_depth": 45.0,
+    "max_depth": 2000.0,
+    "ocean_region": "Indian Ocean"
+})
+
+_MOCK_STATS = MappingProxyType({
+    "regions": {
+        "Indian Ocean": 450,
+        "Pacific Ocean": 1200,
+        "Atlantic Ocean": 800,
+        "Southern Ocean": 200
+    },
+    "date_range": {
+        "earliest": "2020-01-01",
+        "latest": "2023-12-31"
+    },
+    "parameters": ["temperature", "salinity", "pressure"]
+})
+
+_MOCK_INSIGHTS = [
+    {
+        "type": "anomaly",
+        "title": "Unusual Salinity Spike",
+        "description": "Salinity levels in Arabian Sea are 0.3 PSU above normal for this time of year",
+        "severity": "medium",
+        "region": "Arabian Sea",
+        "date": "2023-08-15"
+    },
+    {
+        "type": "trend",
+        "title": "Indian Ocean Warming",
+        "description": "Surface temperatures have increased 0.2°C over the past 5 years",
+        "severity": "low",
+        "region": "Indian Ocean",
+        "trend_value": "+0.2°C/5yr"
+    },
+    {
+        "type": "prediction",
+        "title": "Cyclone Risk Alert",
+        "description": "High ocean heat content detected - favorable conditions for cyclone development",
+        "severity": "high",
+        "region": "Bay of Bengal",
+        "confidence": 0.78
+    }
+]
+_INSIGHTS_JSON = orjson.dumps({"insights": _MOCK_INSIGHTS})
+_INSIGHTS_ETAG = _etag(_INSIGHTS_JSON)
+
+_EXAMPLE_QUERIES = [
+    {
+        "category": "Basic Queries",
+        "queries": [
+            "Show me temperature profiles near Chennai",
+            "What's the salinity in Arabian Sea last month?",
+            "Find ARGO floats near 15°N, 75°E"
+        ]
+    },
+    {
+        "category": "Advanced Analysis",
+        "queries": [
+            "Compare oxygen levels between monsoon seasons",
+            "Show temperature anomalies in Indian Ocean",
+            "Analyze salinity trends over last 5 years"
+        ]
+    },
+    {
+        "category": "Regional Focus",
+        "queries": [
+            "How has Bay of Bengal temperature changed?",
+            "Show me profiles in Lakshadweep region",
+            "Compare Indian Ocean vs Pacific temperatures"
+        ]
+    }
+]
+_EXAMPLE_QUERIES_JSON = orjson.dumps({"examples": _EXAMPLE_QUERIES})
+_EXAMPLE_QUERIES_ETAG = _etag(_EXAMPLE_QUERIES_JSON)
 
 @router.post("/query", response_model=QueryResponse)
 async def process_natural_language_query(request: QueryRequest):
     """Process natural language query about ARGO data"""
     try:
+        cache_key = _response_cache_key(request)
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # For demo purposes, return mock response
-        # In production: result = rag_system.process_query(request.query)
+        # In production: result = await rag_system.aprocess_query(request.query)
         
         mock_result = {
             "query": request.query,
@@ -39,11 +186,24 @@ async def process_natural_language_query(request: QueryRequest):
             "success": True
         }
         
-        return QueryResponse(**mock_result)
+        response = QueryResponse(**mock_result)
+        with _response_cache_lock:
+            _response_cache[cache_key] = response
+        
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/cache/clear")
+async def clear_response_cache():
+    """Drop all cached query responses"""
+    with _response_cache_lock:
+        cleared = len(_response_cache)
+        _response_cache.clear()
+    
+    return {"cleared": cleared}
+
 @router.get("/profiles/search")
 async def search_profiles(
     lat_min: float = Query(-90, ge=-90, le=90),
@@ -57,140 +217,47 @@ async def search_profiles(
     """Search ARGO profiles by location and time"""
     try:
         # Mock response for demo
-        mock_profiles = [
-            {
-                "profile_id": "550e8400-e29b-41d4-a716-446655440000",
-                "platform_number": "2900123",
-                "latitude": 15.5,
-                "longitude": 75.2,
-                "measurement_date": "2023-08-15T12:00:00Z",
-                "max_depth": 2000.0,
-                "ocean_region": "Indian Ocean"
-            }
-        ]
-        
-        return {"profiles": mock_profiles, "total_count": len(mock_profiles)}
+        return Response(content=_SEARCH_RESULTS_JSON, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/profiles/{profile_id}")
-async def get_profile_details(profile_id: str):
+async def get_profile_details(profile_id: str, request: Request):
     """Get detailed profile data"""
     try:
         # Mock detailed profile
-        mock_profile = {
-            "profile_id": profile_id,
-            "platform_number": "2900123",
-            "cycle_number": 45,
-            "latitude": 15.5,
-            "longitude": 75.2,
-            "measurement_date": "2023-08-15T12:00:00Z",
-            "pressure_levels": [2.5, 10.0, 20.0, 30.0, 50.0, 75.0, 100.0],
-            "temperature": [28.5, 28.2, 27.8, 26.5, 24.2, 22.1, 20.8],
-            "salinity": [34.2, 34.5, 34.8, 35.1, 35.3, 35.4, 35.5],
-            "mixed_layer_depth": 45.0,
-            "max_depth": 2000.0,
-            "ocean_region": "Indian Ocean"
-        }
+        mock_profile = {"profile_id": profile_id, **_MOCK_PROFILE}
         
-        return mock_profile
+        # orjson serializes the numpy profile arrays directly
+        payload = orjson.dumps(mock_profile, option=orjson.OPT_SERIALIZE_NUMPY)
+        return _cacheable_json(request, payload, _etag(payload), max_age=300)
         
     except Exception as e:
         raise HTTPException(status_code=404, detail="Profile not found")
 
 @router.get("/stats")
-async def get_database_stats():
+async def get_database_stats(request: Request, vector_db: ArgoVectorDatabase = Depends(get_vector_db)):
     """Get database statistics"""
     try:
-        stats = vector_db.get_collection_stats()
-        
-        mock_stats = {
-            "total_profiles": stats.get('total_profiles', 0),
-            "regions": {
-                "Indian Ocean": 450,
-                "Pacific Ocean": 1200,
-                "Atlantic Ocean": 800,
-                "Southern Ocean": 200
-            },
-            "date_range": {
-                "earliest": "2020-01-01",
-                "latest": "2023-12-31"
-            },
-            "parameters": ["temperature", "salinity", "pressure"]
-        }
+        stats = await asyncio.to_thread(vector_db.get_collection_stats)
         
-        return mock_stats
+        payload = orjson.dumps({"total_profiles": stats.get('total_profiles', 0), **_MOCK_STATS})
+        return _cacheable_json(request, payload, _etag(payload), max_age=60)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/insights")
-async def get_ai_insights():
+async def get_ai_insights(request: Request):
     """Get AI-generated insights about ocean data"""
     try:
-        mock_insights = [
-            {
-                "type": "anomaly",
-                "title": "Unusual Salinity Spike",
-                "description": "Salinity levels in Arabian Sea are 0.3 PSU above normal for this time of year",
-                "severity": "medium",
-                "region": "Arabian Sea",
-                "date": "2023-08-15"
-            },
-            {
-                "type": "trend",
-                "title": "Indian Ocean Warming",
-                "description": "Surface temperatures have increased 0.2°C over the past 5 years",
-                "severity": "low",
-                "region": "Indian Ocean",
-                "trend_value": "+0.2°C/5yr"
-            },
-            {
-                "type": "prediction",
-                "title": "Cyclone Risk Alert",
-                "description": "High ocean heat content detected - favorable conditions for cyclone development",
-                "severity": "high",
-                "region": "Bay of Bengal",
-                "confidence": 0.78
-            }
-        ]
-        
-        return {"insights": mock_insights}
+        return _cacheable_json(request, _INSIGHTS_JSON, _INSIGHTS_ETAG, max_age=300)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/example-queries")
-async def get_example_queries():
+async def get_example_queries(request: Request):
     """Get example queries for users"""
-    examples = [
-        {
-            "category": "Basic Queries",
-            "queries": [
-                "Show me temperature profiles near Chennai",
-                "What's the salinity in Arabian Sea last month?",
-                "Find ARGO floats near 15°N, 75°E"
-            ]
-        },
-        {
-            "category": "Advanced Analysis",
-            "queries": [
-                "Compare oxygen levels between monsoon seasons",
-                "Show temperature anomalies in Indian Ocean",
-                "Analyze salinity trends over last 5 years"
-            ]
-        },
-        {
-            "category": "Regional Focus",
-            "queries": [
-                "How has Bay of Bengal temperature changed?",
-                "Show me profiles in Lakshadweep region",
-                "Compare Indian Ocean vs Pacific temperatures"
-            ]
-        }
-    ]
-    
-    return {"examples": examples}
-
-
+    return _cacheable_json(request, _EXAMPLE_QUERIES_JSON, _EXAMPLE_QUERIES_ETAG, max_age=3600)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
@@ -8,6 +8,8 @@ class QueryRequest(BaseModel):
     filters: Optional[Dict[str, Any]] = None
 
 class QueryResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     query: str
     sql: Optional[str] = None
     results: List[Dict[str, Any]]
@@ -18,6 +20,8 @@ class QueryResponse(BaseModel):
     error: Optional[str] = None
 
 class ProfileData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     profile_id: str
     platform_number: str
     cycle_number: int
@@ -32,6 +36,8 @@ class ProfileData(BaseModel):
     ocean_region: Optional[str] = None
 
 class InsightData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     type: str  # anomaly, trend, prediction
     title: str
     description: str
@@ -39,5 +45,3 @@ class InsightData(BaseModel):
     region: str
     confidence: Optional[float] = None
     date: Optional[str] = None
-
-
@@ -1,4 +1,5 @@
 import os
+from typing import List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -18,6 +19,7 @@ class Settings(BaseSettings):
     # API
     API_HOST: str = "localhost"
     API_PORT: int = 8000
+    CORS_ORIGINS: List[str] = ["http://localhost:8501", "http://localhost:3000"]
     
     model_config = {"env_file": ".env", "extra": "ignore"}
 
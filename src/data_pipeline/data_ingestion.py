@@ -1,16 +1,60 @@
 import os
 import glob
-from typing import List, Dict
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Iterator, List, Dict, Optional, Tuple
 import logging
 from .netcdf_processor import ArgoNetCDFProcessor
 from .vector_db import ArgoVectorDatabase
 from ..database.connection import DatabaseClient
 from ..database.models import ArgoProfile
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import delete, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, sessionmaker
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Profiles buffered per SQL insert during directory ingest
+SQL_BATCH_SIZE = 1000
+
+# Files handed to each pool task, so derived parameters are computed per batch
+PARSE_BATCH_SIZE = 16
+
+_REGION_STATS_SQL = text(
+    "SELECT ocean_region, COUNT(*) AS c, SUM(COUNT(*)) OVER () AS total "
+    "FROM argo_profiles GROUP BY ocean_region"
+)
+
+_DELETE_DUPLICATES_SQL = text(
+    "DELETE FROM argo_profiles WHERE profile_id IN ("
+    "SELECT profile_id FROM ("
+    "SELECT profile_id, ROW_NUMBER() OVER ("
+    "PARTITION BY platform_number, cycle_number ORDER BY measurement_date DESC"
+    ") AS rn FROM argo_profiles"
+    ") ranked WHERE rn > 1)"
+)
+
+_worker_processor = None
+
+def _file_hash(file_path: str) -> str:
+    """Content hash identifying a NetCDF file across re-ingests"""
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+def _profile_key(profile_data: Dict) -> Tuple[str, int]:
+    """(platform, cycle) key matching the uq_plat_cyc constraint and RETURNING rows"""
+    return str(profile_data['platform_number']), int(profile_data['cycle_number'])
+
+def _process_files(file_paths: List[str]) -> List[Optional[Dict]]:
+    """Parse a batch of NetCDF files in a pool worker; storage stays in the parent"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = ArgoNetCDFProcessor()
+    return _worker_processor.process_many(file_paths)
+
 class DataIngestionPipeline:
     """Main data ingestion pipeline for ARGO data"""
     
@@ -21,6 +65,19 @@ class DataIngestionPipeline:
         self.engine = self.db_client.engine
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """Session that commits on success, rolls back on error and is always closed"""
+        db = self.SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
     def ingest_directory(self, directory_path: str) -> Dict:
         """Ingest all NetCDF files from a directory"""
         try:
@@ -31,26 +88,59 @@ class DataIngestionPipeline:
                 logger.warning(f"No NetCDF files found in {directory_path}")
                 return {"processed": 0, "errors": 0, "files": []}
             
+            # Files whose content is already stored skip parsing and embedding entirely
+            hashes = {file_path: _file_hash(file_path) for file_path in netcdf_files}
+            known = self._known_hashes(list(hashes.values()))
+            skipped_count = len(netcdf_files)
+            netcdf_files = [f for f in netcdf_files if hashes[f] not in known]
+            skipped_count -= len(netcdf_files)
+            
             processed_count = 0
             error_count = 0
             processed_files = []
+            pending = []
             
-            for file_path in netcdf_files:
-                try:
-                    result = self.ingest_single_file(file_path)
-                    if result:
-                        processed_count += 1
-                        processed_files.append(file_path)
-                    else:
+            # Files are parsed in parallel; the vector DB and SQL writes stay in this
+            # process so workers never open their own database handles. One session
+            # serves every SQL batch of the directory
+            with self._session() as db, ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                batches = [
+                    netcdf_files[i:i + PARSE_BATCH_SIZE]
+                    for i in range(0, len(netcdf_files), PARSE_BATCH_SIZE)
+                ]
+                parsed = chain.from_iterable(executor.map(_process_files, batches))
+                for file_path, profile_data in zip(netcdf_files, parsed):
+                    try:
+                        if not profile_data:
+                            logger.warning(f"Failed to process {file_path}")
+                            error_count += 1
+                        else:
+                            profile_data['file_hash'] = hashes[file_path]
+                            pending.append((file_path, profile_data))
+                            
+                    except Exception as e:
+                        logger.error(f"Error processing {file_path}: {e}")
                         error_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {e}")
-                    error_count += 1
+                    
+                    # Embeddings and SQL rows are written in batches rather than per file
+                    if len(pending) >= SQL_BATCH_SIZE:
+                        saved, duplicates = self._flush_pending(pending, db)
+                        processed_count += len(saved)
+                        skipped_count += duplicates
+                        error_count += len(pending) - len(saved) - duplicates
+                        processed_files.extend(saved)
+                        pending = []
+                
+                saved, duplicates = self._flush_pending(pending, db)
+                processed_count += len(saved)
+                skipped_count += duplicates
+                error_count += len(pending) - len(saved) - duplicates
+                processed_files.extend(saved)
             
             return {
                 "processed": processed_count,
                 "errors": error_count,
+                "skipped": skipped_count,
                 "files": processed_files
             }
             
@@ -61,86 +151,164 @@ class DataIngestionPipeline:
     def ingest_single_file(self, file_path: str) -> bool:
         """Ingest a single NetCDF file"""
         try:
+            file_hash = _file_hash(file_path)
+            if self._known_hashes([file_hash]):
+                logger.info(f"Skipping {file_path}: already ingested")
+                return True
+            
             # Process NetCDF file
             profile_data = self.processor.process_argo_file(file_path)
-            
+            if profile_data:
+                profile_data['file_hash'] = file_hash
+            return self._store_profile(file_path, profile_data)
+                
+        except Exception as e:
+            logger.error(f"Error ingesting {file_path}: {e}")
+            return False
+    
+    def _store_profile(self, file_path: str, profile_data: Optional[Dict]) -> bool:
+        """Write a processed profile to the vector and SQL databases"""
+        try:
             if not profile_data:
                 logger.warning(f"Failed to process {file_path}")
                 return False
             
-            # Add to vector database
-            vector_success = self.vector_db.add_profile(profile_data)
-            
-            # Add to SQL database
-            sql_success = self._save_to_database(profile_data)
+            # Add to SQL database first so an existing float cycle is not embedded again
+            with self._session() as db:
+                inserted = self._save_to_database([profile_data], db)
+            if inserted is None:
+                return False
+            if not inserted:
+                logger.info(f"Skipping {file_path}: profile already stored")
+                return True
             
-            if vector_success and sql_success:
+            # Add to vector database; without a vector the row is removed again so
+            # its file hash doesn't mark the file as ingested
+            if self.vector_db.add_profile(profile_data):
                 logger.info(f"Successfully ingested {file_path}")
                 return True
             else:
-                logger.warning(f"Partial success for {file_path}")
+                with self._session() as db:
+                    self._delete_profiles([_profile_key(profile_data)], db)
+                logger.warning(f"Failed to embed {file_path}; it will be retried on the next ingest")
                 return False
                 
         except Exception as e:
             logger.error(f"Error ingesting {file_path}: {e}")
             return False
     
-    def _save_to_database(self, profile_data: Dict) -> bool:
-        """Save profile data to SQL database"""
-        try:
-            db = self.SessionLocal()
-            
-            # Create ArgoProfile instance
-            argo_profile = ArgoProfile(
-                platform_number=profile_data['platform_number'],
-                cycle_number=profile_data['cycle_number'],
-                latitude=profile_data['latitude'],
-                longitude=profile_data['longitude'],
-                measurement_date=profile_data['measurement_date'],
-                pressure_levels=profile_data['pressure_levels'],
-                temperature=profile_data['temperature'],
-                salinity=profile_data['salinity'],
-                temp_qc=profile_data.get('temp_qc', []),
-                psal_qc=profile_data.get('psal_qc', []),
-                mixed_layer_depth=profile_data.get('mixed_layer_depth'),
-                max_depth=profile_data.get('max_depth'),
-                ocean_region=profile_data.get('ocean_region'),
-                data_source=profile_data.get('data_source', 'ARGO'),
-                metadata=profile_data.get('metadata', {})
+    def _known_hashes(self, file_hashes: List[str]) -> set:
+        """Return the subset of file hashes already stored, in one round trip"""
+        if not file_hashes:
+            return set()
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(ArgoProfile.file_hash).where(ArgoProfile.file_hash.in_(file_hashes))
+            )
+            return {row.file_hash for row in rows}
+    
+    def _flush_pending(self, pending: List[Tuple[str, Dict]], db: Session) -> Tuple[List[str], int]:
+        """Save a batch of (file_path, profile) pairs, returning stored paths and duplicate count"""
+        if not pending:
+            return [], 0
+        inserted = self._save_to_database([profile_data for _, profile_data in pending], db)
+        if inserted is None:
+            return [], 0
+        
+        # Rows skipped by ON CONFLICT are already stored and embedded, so only
+        # profiles that were actually inserted get vectors
+        new = []
+        for file_path, profile_data in pending:
+            key = _profile_key(profile_data)
+            if key in inserted:
+                inserted.discard(key)
+                new.append((file_path, profile_data))
+        duplicates = len(pending) - len(new)
+        
+        stored = self.vector_db.add_profiles([profile_data for _, profile_data in new])
+        if len(stored) < len(new):
+            logger.warning(f"Vector DB stored {len(stored)} of {len(new)} new profiles")
+            # Rows without a vector are removed so their files are retried next time
+            embedded = set(stored)
+            self._delete_profiles(
+                [_profile_key(profile_data) for i, (_, profile_data) in enumerate(new) if i not in embedded],
+                db
             )
+        for i in stored:
+            logger.info(f"Successfully ingested {new[i][0]}")
+        return [new[i][0] for i in stored], duplicates
+    
+    def _delete_profiles(self, keys: List[Tuple[str, int]], db: Session) -> None:
+        """Remove freshly inserted rows whose embedding failed"""
+        if not keys:
+            return
+        try:
+            db.execute(delete(ArgoProfile).where(
+                tuple_(ArgoProfile.platform_number, ArgoProfile.cycle_number).in_(keys)
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error removing unembedded profiles: {e}")
+    
+    def _save_to_database(self, profiles: List[Dict], db: Session) -> Optional[set]:
+        """Save a batch of profiles in one transaction, returning the (platform, cycle) keys inserted"""
+        try:
+            # Plain mapping rows skip the per-object ORM unit of work
+            rows = [
+                {
+                    'platform_number': profile_data['platform_number'],
+                    'cycle_number': profile_data['cycle_number'],
+                    'latitude': profile_data['latitude'],
+                    'longitude': profile_data['longitude'],
+                    'measurement_date': profile_data['measurement_date'],
+                    'pressure_levels': profile_data['pressure_levels'],
+                    'temperature': profile_data['temperature'],
+                    'salinity': profile_data['salinity'],
+                    'temp_qc': profile_data.get('temp_qc', []),
+                    'psal_qc': profile_data.get('psal_qc', []),
+                    'mixed_layer_depth': profile_data.get('mixed_layer_depth'),
+                    'max_depth': profile_data.get('max_depth'),
+                    'ocean_region': profile_data.get('ocean_region'),
+                    'data_source': profile_data.get('data_source', 'ARGO'),
+                    'profile_metadata': profile_data.get('metadata', {}),
+                    'file_hash': profile_data.get('file_hash')
+                }
+                for profile_data in profiles
+            ]
             
-            db.add(argo_profile)
+            # Profiles already stored for the same float cycle or file are skipped and
+            # left out of RETURNING
+            stmt = pg_insert(ArgoProfile).on_conflict_do_nothing().returning(
+                ArgoProfile.platform_number, ArgoProfile.cycle_number
+            )
+            inserted = {(row.platform_number, row.cycle_number) for row in db.execute(stmt, rows)}
             db.commit()
-            db.close()
             
-            return True
+            return inserted
             
         except Exception as e:
+            # Leave the shared session usable for the next batch
+            db.rollback()
             logger.error(f"Error saving to database: {e}")
-            return False
+            return None
     
     def get_ingestion_stats(self) -> Dict:
         """Get statistics about ingested data"""
         try:
-            # Get SQL database stats
-            db = self.SessionLocal()
-            total_profiles = db.query(ArgoProfile).count()
+            # Get SQL database stats: per-region counts and the grand total in one scan
+            with self.engine.connect() as connection:
+                regional_stats = connection.execute(_REGION_STATS_SQL).all()
+            
+            total_profiles = int(regional_stats[0].total) if regional_stats else 0
             
             # Get vector database stats
             vector_stats = self.vector_db.get_collection_stats()
             
-            # Get regional distribution
-            regional_stats = db.query(
-                ArgoProfile.ocean_region,
-                db.func.count(ArgoProfile.profile_id)
-            ).group_by(ArgoProfile.ocean_region).all()
-            
-            db.close()
-            
             return {
                 "total_profiles": total_profiles,
                 "vector_db_profiles": vector_stats.get('total_profiles', 0),
-                "regional_distribution": dict(regional_stats),
+                "regional_distribution": {row.ocean_region: row.c for row in regional_stats},
                 "embedding_model": vector_stats.get('embedding_model', 'unknown')
             }
             
@@ -151,36 +319,9 @@ class DataIngestionPipeline:
     def cleanup_duplicates(self) -> int:
         """Remove duplicate profiles based on platform_number and cycle_number"""
         try:
-            db = self.SessionLocal()
-            
-            # Find duplicates
-            duplicates = db.query(
-                ArgoProfile.platform_number,
-                ArgoProfile.cycle_number,
-                db.func.count(ArgoProfile.profile_id)
-            ).group_by(
-                ArgoProfile.platform_number,
-                ArgoProfile.cycle_number
-            ).having(
-                db.func.count(ArgoProfile.profile_id) > 1
-            ).all()
-            
-            removed_count = 0
-            
-            for platform, cycle, count in duplicates:
-                # Keep the most recent profile, remove others
-                profiles = db.query(ArgoProfile).filter(
-                    ArgoProfile.platform_number == platform,
-                    ArgoProfile.cycle_number == cycle
-                ).order_by(ArgoProfile.measurement_date.desc()).all()
-                
-                # Remove all but the first (most recent)
-                for profile in profiles[1:]:
-                    db.delete(profile)
-                    removed_count += 1
-            
-            db.commit()
-            db.close()
+            with self._session() as db:
+                # Keep the most recent profile per (platform, cycle), remove others
+                removed_count = db.execute(_DELETE_DUPLICATES_SQL).rowcount
             
             logger.info(f"Removed {removed_count} duplicate profiles")
             return removed_count
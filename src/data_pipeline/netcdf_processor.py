@@ -1,4 +1,5 @@
 import xarray as xr
+import netCDF4
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
@@ -7,10 +8,36 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Temperature departure from the surface (°C) that marks the mixed layer base
+MLD_THRESHOLD = 0.2
+
+# Region names in the order _determine_ocean_regions tests them
+OCEAN_REGIONS = ('Southern Ocean', 'Arctic Ocean', 'Indian Ocean', 'Pacific Ocean', 'Atlantic Ocean')
+
+def _juld_to_timestamp(days_since: float) -> pd.Timestamp:
+    """Convert an ARGO JULD value (days since 1950-01-01) to a timestamp"""
+    return pd.Timestamp('1950-01-01') + pd.Timedelta(days=days_since)
+
+def _mld_and_max_depth(T: np.ndarray, P: np.ndarray, counts: np.ndarray,
+                       threshold: float = MLD_THRESHOLD):
+    """Mixed layer and maximum depth for each row of left-aligned, NaN-padded (N, L) matrices"""
+    rows = np.arange(T.shape[0])
+    
+    # MLD is the first level whose temperature departs from the surface by more
+    # than the threshold, else the deepest valid level; NaN padding compares False
+    exceeds = np.abs(T - T[:, :1]) > threshold
+    first = exceeds.argmax(axis=1)
+    deepest = P[rows, counts - 1]
+    mld = np.where(exceeds[rows, first], P[rows, first], deepest)
+    return mld, np.nanmax(P, axis=1)
+
 class ArgoNetCDFProcessor:
     """Process ARGO NetCDF files and extract structured data"""
     
-    def __init__(self):
+    def __init__(self, use_xarray: bool = False):
+        # netCDF4 reads the handful of variables we need without xarray's
+        # coordinate and attribute decoding; xarray remains available as a fallback
+        self.use_xarray = use_xarray
         self.quality_flags = {
             1: 'good',
             2: 'probably_good', 
@@ -23,40 +50,102 @@ class ArgoNetCDFProcessor:
     
     def process_argo_file(self, file_path: str) -> Dict:
         """Process single ARGO NetCDF file"""
+        return self.process_many([file_path])[0]
+    
+    def process_many(self, file_paths: List[str]) -> List[Optional[Dict]]:
+        """Process several ARGO NetCDF files, returning one profile (or None) per path"""
+        raw_profiles = []
+        for file_path in file_paths:
+            try:
+                # The handle is closed once the fields have been read out
+                if self.use_xarray:
+                    with xr.open_dataset(file_path, decode_times=False) as ds:
+                        raw_profiles.append(self._extract_profile(ds))
+                else:
+                    with netCDF4.Dataset(file_path, mode='r') as ds:
+                        raw_profiles.append(self._extract_profile_nc(ds))
+            except Exception as e:
+                logger.error(f"Error processing {file_path}: {e}")
+                raw_profiles.append(None)
+        
+        extracted = [profile_data for profile_data in raw_profiles if profile_data is not None]
+        derived = iter(self._calculate_derived_parameters(extracted))
+        regions = iter(self._determine_ocean_regions(
+            [profile_data['latitude'] for profile_data in extracted],
+            [profile_data['longitude'] for profile_data in extracted]
+        ))
+        
+        return [
+            self._finish_profile(profile_data, next(derived), next(regions))
+            if profile_data is not None else None
+            for profile_data in raw_profiles
+        ]
+    
+    def _extract_profile(self, ds: xr.Dataset) -> Dict:
+        """Extract basic profile information from an open dataset"""
+        return {
+            'platform_number': self._extract_platform_number(ds),
+            'cycle_number': int(ds.CYCLE_NUMBER.values[0]) if 'CYCLE_NUMBER' in ds else 0,
+            'latitude': float(ds.LATITUDE.values[0]),
+            'longitude': float(ds.LONGITUDE.values[0]),
+            'measurement_date': self._extract_date(ds),
+            # Level arrays stay NumPy until _clean_profile_data converts them for storage
+            'pressure_levels': ds.PRES.values[0].astype(np.float32, copy=False),
+            'temperature': ds.TEMP.values[0].astype(np.float32, copy=False),
+            'salinity': ds.PSAL.values[0].astype(np.float32, copy=False),
+            'temp_qc': ds.TEMP_QC.values[0] if 'TEMP_QC' in ds else [],
+            'psal_qc': ds.PSAL_QC.values[0] if 'PSAL_QC' in ds else [],
+        }
+    
+    def _extract_profile_nc(self, ds: netCDF4.Dataset) -> Dict:
+        """Extract basic profile information from an open netCDF4 dataset"""
+        variables = ds.variables
+        
+        def levels(name: str) -> np.ndarray:
+            return np.ma.filled(variables[name][0].astype(np.float32), np.nan)
+        
+        def flags(name: str):
+            return np.ma.getdata(variables[name][0]) if name in variables else []
+        
+        if 'PLATFORM_NUMBER' in variables:
+            # Char arrays come back as S1 cells unless the file declares an _Encoding
+            platform_number = variables['PLATFORM_NUMBER'][0]
+            if not isinstance(platform_number, str):
+                platform_number = netCDF4.chartostring(np.ma.getdata(platform_number))
+            platform_number = str(platform_number).strip()
+        else:
+            platform_number = "UNKNOWN"
+        
+        if 'JULD' in variables:
+            measurement_date = _juld_to_timestamp(float(variables['JULD'][0]))
+        else:
+            measurement_date = pd.Timestamp.now()
+        
+        return {
+            'platform_number': platform_number,
+            'cycle_number': int(variables['CYCLE_NUMBER'][0]) if 'CYCLE_NUMBER' in variables else 0,
+            'latitude': float(variables['LATITUDE'][0]),
+            'longitude': float(variables['LONGITUDE'][0]),
+            'measurement_date': measurement_date,
+            'pressure_levels': levels('PRES'),
+            'temperature': levels('TEMP'),
+            'salinity': levels('PSAL'),
+            'temp_qc': flags('TEMP_QC'),
+            'psal_qc': flags('PSAL_QC'),
+        }
+    
+    def _finish_profile(self, profile_data: Dict, derived_params: Dict,
+                        ocean_region: str) -> Optional[Dict]:
+        """Add derived parameters and region to an extracted profile, then clean it"""
         try:
-            # Open dataset with proper time decoding
-            ds = xr.open_dataset(file_path, decode_times=False)
-            
-            # Extract basic profile information
-            profile_data = {
-                'platform_number': self._extract_platform_number(ds),
-                'cycle_number': int(ds.CYCLE_NUMBER.values[0]) if 'CYCLE_NUMBER' in ds else 0,
-                'latitude': float(ds.LATITUDE.values[0]),
-                'longitude': float(ds.LONGITUDE.values[0]),
-                'measurement_date': self._extract_date(ds),
-                'pressure_levels': ds.PRES.values[0].tolist(),
-                'temperature': ds.TEMP.values[0].tolist(),
-                'salinity': ds.PSAL.values[0].tolist(),
-                'temp_qc': ds.TEMP_QC.values[0].tolist() if 'TEMP_QC' in ds else [],
-                'psal_qc': ds.PSAL_QC.values[0].tolist() if 'PSAL_QC' in ds else [],
-            }
-            
-            # Calculate derived parameters
-            derived_params = self._calculate_derived_parameters(profile_data)
             profile_data.update(derived_params)
-            
-            # Determine ocean region
-            profile_data['ocean_region'] = self._determine_ocean_region(
-                profile_data['latitude'], profile_data['longitude']
-            )
+            profile_data['ocean_region'] = ocean_region
             
             # Clean data
-            profile_data = self._clean_profile_data(profile_data)
-            
-            return profile_data
+            return self._clean_profile_data(profile_data)
             
         except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
+            logger.error(f"Error processing profile {profile_data.get('platform_number')}: {e}")
             return None
     
     def _extract_platform_number(self, ds: xr.Dataset) -> str:
@@ -68,93 +157,117 @@ class ArgoNetCDFProcessor:
     def _extract_date(self, ds: xr.Dataset) -> pd.Timestamp:
         """Extract measurement date from dataset"""
         if 'JULD' in ds:
-            # JULD is days since 1950-01-01
-            reference_date = pd.Timestamp('1950-01-01')
-            days_since = float(ds.JULD.values[0])
-            return reference_date + pd.Timedelta(days=days_since)
+            return _juld_to_timestamp(float(ds.JULD.values[0]))
         return pd.Timestamp.now()
     
-    def _calculate_derived_parameters(self, profile_data: Dict) -> Dict:
-        """Calculate derived oceanographic parameters"""
+    def _calculate_derived_parameters(self, profiles: List[Dict]) -> List[Dict]:
+        """Calculate derived oceanographic parameters for a batch of profiles"""
+        fallback = [{'max_depth': 0, 'mixed_layer_depth': 0} for _ in profiles]
+        
         try:
-            temp = np.array(profile_data['temperature'])
-            sal = np.array(profile_data['salinity'])
-            pres = np.array(profile_data['pressure_levels'])
-            lat = profile_data['latitude']
-            lon = profile_data['longitude']
+            # Remove NaN values for calculations; profiles with fewer than 3 valid
+            # levels keep the fallback values
+            columns = []
+            for i, profile_data in enumerate(profiles):
+                temp = np.asarray(profile_data['temperature'], dtype=np.float32)
+                sal = np.asarray(profile_data['salinity'], dtype=np.float32)
+                pres = np.asarray(profile_data['pressure_levels'], dtype=np.float32)
+                valid_mask = ~(np.isnan(temp) | np.isnan(sal) | np.isnan(pres))
+                if np.sum(valid_mask) >= 3:
+                    columns.append((i, temp[valid_mask], sal[valid_mask], pres[valid_mask]))
             
-            # Remove NaN values for calculations
-            valid_mask = ~(np.isnan(temp) | np.isnan(sal) | np.isnan(pres))
+            if not columns:
+                return fallback
             
-            if np.sum(valid_mask) < 3:
-                return {'max_depth': 0, 'mixed_layer_depth': 0}
-            
-            temp_clean = temp[valid_mask]
-            sal_clean = sal[valid_mask]
-            pres_clean = pres[valid_mask]
+            # Left-align the valid levels into NaN-padded (N, L) matrices so each gsw
+            # ufunc runs once over the whole batch
+            counts = [len(temp) for _, temp, _, _ in columns]
+            shape = (len(columns), max(counts))
+            T = np.full(shape, np.nan, dtype=np.float32)
+            S = np.full(shape, np.nan, dtype=np.float32)
+            P = np.full(shape, np.nan, dtype=np.float32)
+            for row, (_, temp, sal, pres) in enumerate(columns):
+                T[row, :len(temp)] = temp
+                S[row, :len(sal)] = sal
+                P[row, :len(pres)] = pres
+            lat = np.array([profiles[i]['latitude'] for i, _, _, _ in columns])
+            lon = np.array([profiles[i]['longitude'] for i, _, _, _ in columns])
             
             # Calculate absolute salinity and conservative temperature
-            SA = gsw.SA_from_SP(sal_clean, pres_clean, lon, lat)
-            CT = gsw.CT_from_t(SA, temp_clean, pres_clean)
+            SA = gsw.SA_from_SP(S, P, lon[:, None], lat[:, None])
+            CT = gsw.CT_from_t(SA, T, P)
             
             # Calculate potential density
             sigma0 = gsw.sigma0(SA, CT)
             
             # Calculate mixed layer depth (simple gradient method)
-            mld = self._calculate_mld(temp_clean, pres_clean)
+            mld, max_depth = _mld_and_max_depth(T, P, np.asarray(counts))
+            
+            results = fallback
+            for row, (i, _, _, _) in enumerate(columns):
+                n = counts[row]
+                results[i] = {
+                    'absolute_salinity': SA[row, :n],
+                    'conservative_temperature': CT[row, :n],
+                    'potential_density': sigma0[row, :n],
+                    'mixed_layer_depth': float(mld[row]),
+                    'max_depth': float(max_depth[row])
+                }
             
-            return {
-                'absolute_salinity': SA.tolist(),
-                'conservative_temperature': CT.tolist(),
-                'potential_density': sigma0.tolist(),
-                'mixed_layer_depth': float(mld),
-                'max_depth': float(np.max(pres_clean))
-            }
+            return results
             
         except Exception as e:
             logger.warning(f"Error calculating derived parameters: {e}")
-            return {'max_depth': 0, 'mixed_layer_depth': 0}
+            return [{'max_depth': 0, 'mixed_layer_depth': 0} for _ in profiles]
     
     def _calculate_mld(self, temperature: np.ndarray, pressure: np.ndarray, 
-                      threshold: float = 0.2) -> float:
+                      threshold: float = MLD_THRESHOLD) -> float:
         """Calculate mixed layer depth using temperature criterion"""
         if len(temperature) < 2:
             return 0.0
         
-        surface_temp = temperature[0]
-        
-        for i, (temp, depth) in enumerate(zip(temperature, pressure)):
-            if abs(temp - surface_temp) > threshold:
-                return depth
+        mask = np.abs(temperature - temperature[0]) > threshold
+        first = mask.argmax()
+        if mask[first]:
+            return pressure[first]
         
         return pressure[-1] if len(pressure) > 0 else 0.0
     
     def _determine_ocean_region(self, lat: float, lon: float) -> str:
         """Determine ocean region based on coordinates"""
+        return self._determine_ocean_regions([lat], [lon])[0]
+    
+    def _determine_ocean_regions(self, lat: List[float], lon: List[float]) -> List[str]:
+        """Determine ocean regions for a batch of coordinates in one pass"""
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        if lat.size == 0:
+            return []
+        
         # Convert longitude to 0-360 if needed
-        if lon < 0:
-            lon += 360
-            
-        if lat >= -60 and lat <= 30 and lon >= 20 and lon <= 120:
-            return 'Indian Ocean'
-        elif ((lon >= 120 and lon <= 290) or (lon >= 290 and lon <= 360) or 
-              (lon >= 0 and lon <= 70)):
-            return 'Pacific Ocean'
-        elif lon >= 290 or lon <= 20:
-            return 'Atlantic Ocean'
-        elif lat < -60:
-            return 'Southern Ocean'
-        elif lat > 66:
-            return 'Arctic Ocean'
-        else:
-            return 'Unknown'
+        lon = np.where(lon < 0, lon + 360, lon)
+        
+        # Polar bands first, then the basins by longitude; earlier conditions win
+        conditions = [
+            lat < -60,
+            lat > 66,
+            (lat <= 30) & (lon >= 20) & (lon <= 120),
+            (lon >= 120) & (lon <= 290),
+            (lon >= 290) | (lon <= 20),
+        ]
+        return np.select(conditions, OCEAN_REGIONS, default='Unknown').tolist()
     
     def _clean_profile_data(self, profile_data: Dict) -> Dict:
         """Clean and validate profile data"""
         # Replace NaN values with None for JSON serialization
         for key, value in profile_data.items():
-            if isinstance(value, list):
-                profile_data[key] = [None if pd.isna(x) else x for x in value]
+            if isinstance(value, (np.ndarray, list)):
+                # One vectorized NaN test per array; only the missing slots are patched
+                missing = np.flatnonzero(pd.isna(value))
+                value = value.tolist() if isinstance(value, np.ndarray) else list(value)
+                for i in missing:
+                    value[i] = None
+                profile_data[key] = value
             elif pd.isna(value):
                 profile_data[key] = None
         
@@ -1,18 +1,66 @@
 import chromadb
 from sentence_transformers import SentenceTransformer
-import numpy as np
+import torch
+from functools import lru_cache
 from typing import List, Dict, Optional
 import uuid
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Summaries encoded per forward pass when adding profiles in bulk
+ENCODE_BATCH_SIZE = 64
+
+@lru_cache(maxsize=None)
+def _load_embedding_model(name: str) -> SentenceTransformer:
+    """Load a sentence encoder once per process and share it across instances"""
+    # Run on the GPU in half precision when one is available
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = SentenceTransformer(name, device=device)
+    if device == 'cuda':
+        model.half()
+    return model
+
+# Reproduces the original summary text exactly, source indentation included,
+# so new embeddings stay comparable with the ones already stored
+_SUMMARY_TEMPLATE = (
+    "ARGO Float {platform} collected oceanographic data\n"
+    "            on {date} \n"
+    "            at location {latitude:.2f}°N, {longitude:.2f}°E\n"
+    "            in the {region}.\n"
+    "            \n"
+    "            Temperature profile: {temp_min:.1f}°C to {temp_max:.1f}°C\n"
+    "            Salinity profile: {sal_min:.2f} to {sal_max:.2f} PSU\n"
+    "            Maximum depth: {max_depth:.0f}m\n"
+    "            Mixed layer depth: {mld:.0f}m\n"
+    "            \n"
+    "            This profile shows {warmth} \n"
+    "            water conditions with {sal_level} \n"
+    "            salinity levels typical of {region_short} waters."
+)
+
+def _profile_metadata(profile_data: Dict, profile_id: str) -> Dict:
+    """Chroma metadata stored alongside a profile embedding"""
+    return {
+        'profile_id': profile_id,
+        'platform_number': str(profile_data.get('platform_number', '')),
+        'latitude': float(profile_data.get('latitude', 0)),
+        'longitude': float(profile_data.get('longitude', 0)),
+        'date': str(profile_data.get('measurement_date', '')),
+        'ocean_region': str(profile_data.get('ocean_region', '')),
+        'max_depth': float(profile_data.get('max_depth', 0)),
+        'mixed_layer_depth': float(profile_data.get('mixed_layer_depth', 0))
+    }
+
 class ArgoVectorDatabase:
     """Vector database for ARGO profile semantic search"""
     
     def __init__(self, persist_directory: str = "./data/vectordb"):
         self.client = chromadb.PersistentClient(path=persist_directory)
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.embedding_model = _load_embedding_model(EMBEDDING_MODEL)
         self.collection = self.client.get_or_create_collection(
             name="argo_profiles",
             metadata={"hnsw:space": "cosine"}
@@ -20,73 +68,93 @@ class ArgoVectorDatabase:
     
     def generate_profile_summary(self, profile_data: Dict) -> str:
         """Generate searchable text summary for ARGO profile"""
+        platform = profile_data.get('platform_number', 'UNKNOWN')
         
         try:
             temp_data = [x for x in profile_data.get('temperature', []) if x is not None]
             sal_data = [x for x in profile_data.get('salinity', []) if x is not None]
             
             if not temp_data or not sal_data:
-                return f"ARGO Float {profile_data.get('platform_number', 'UNKNOWN')} - incomplete data"
-            
-            temp_range = f"{min(temp_data):.1f}°C to {max(temp_data):.1f}°C"
-            sal_range = f"{min(sal_data):.2f} to {max(sal_data):.2f} PSU"
-            
-            summary = f"""
-            ARGO Float {profile_data.get('platform_number', 'UNKNOWN')} collected oceanographic data
-            on {profile_data.get('measurement_date', 'unknown date')} 
-            at location {profile_data.get('latitude', 0):.2f}°N, {profile_data.get('longitude', 0):.2f}°E
-            in the {profile_data.get('ocean_region', 'unknown region')}.
-            
-            Temperature profile: {temp_range}
-            Salinity profile: {sal_range}
-            Maximum depth: {profile_data.get('max_depth', 0):.0f}m
-            Mixed layer depth: {profile_data.get('mixed_layer_depth', 0):.0f}m
+                return f"ARGO Float {platform} - incomplete data"
             
-            This profile shows {"warm" if np.mean(temp_data) > 20 else "cold"} 
-            water conditions with {"high" if np.mean(sal_data) > 35 else "low"} 
-            salinity levels typical of {profile_data.get('ocean_region', 'unknown')} waters.
-            """
+            mean_temp = sum(temp_data) / len(temp_data)
+            mean_sal = sum(sal_data) / len(sal_data)
             
-            return summary.strip()
+            region = profile_data.get('ocean_region', 'unknown region')
+            return _SUMMARY_TEMPLATE.format_map({
+                'platform': platform,
+                'date': profile_data.get('measurement_date', 'unknown date'),
+                'latitude': profile_data.get('latitude', 0),
+                'longitude': profile_data.get('longitude', 0),
+                'region': region,
+                'temp_min': min(temp_data),
+                'temp_max': max(temp_data),
+                'sal_min': min(sal_data),
+                'sal_max': max(sal_data),
+                'max_depth': profile_data.get('max_depth', 0),
+                'mld': profile_data.get('mixed_layer_depth', 0),
+                'warmth': "warm" if mean_temp > 20 else "cold",
+                'sal_level': "high" if mean_sal > 35 else "low",
+                'region_short': profile_data.get('ocean_region', 'unknown')
+            })
             
-        except Exception as e:
-            logger.error(f"Error generating profile summary: {e}")
-            return f"ARGO Float {profile_data.get('platform_number', 'UNKNOWN')} - error in summary generation"
+        except Exception:
+            return f"ARGO Float {platform} - error in summary generation"
     
     def add_profile(self, profile_data: Dict) -> bool:
         """Add profile to vector database"""
+        return bool(self.add_profiles([profile_data]))
+    
+    def add_profiles(self, profiles: List[Dict]) -> List[int]:
+        """Add a batch of profiles with one encode pass, returning the positions stored"""
+        # A profile whose summary or metadata can't be built is dropped, not the batch
+        prepared = []
+        for position, profile_data in enumerate(profiles):
+            try:
+                profile_id = str(profile_data.get('profile_id', uuid.uuid4()))
+                prepared.append((
+                    position,
+                    profile_id,
+                    self.generate_profile_summary(profile_data),
+                    _profile_metadata(profile_data, profile_id)
+                ))
+            except Exception as e:
+                platform = profile_data.get('platform_number', 'UNKNOWN')
+                logger.error(f"Error preparing profile of float {platform} for vector DB: {e}")
+        
+        if not prepared:
+            return []
+        
         try:
-            summary = self.generate_profile_summary(profile_data)
-            embedding = self.embedding_model.encode(summary)
-            
-            profile_id = str(profile_data.get('profile_id', uuid.uuid4()))
+            positions, ids, summaries, metadatas = map(list, zip(*prepared))
+            embeddings = self.embedding_model.encode(
+                summaries,
+                batch_size=ENCODE_BATCH_SIZE,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
             
             self.collection.add(
-                embeddings=[embedding.tolist()],
-                documents=[summary],
-                metadatas=[{
-                    'profile_id': profile_id,
-                    'platform_number': str(profile_data.get('platform_number', '')),
-                    'latitude': float(profile_data.get('latitude', 0)),
-                    'longitude': float(profile_data.get('longitude', 0)),
-                    'date': str(profile_data.get('measurement_date', '')),
-                    'ocean_region': str(profile_data.get('ocean_region', '')),
-                    'max_depth': float(profile_data.get('max_depth', 0)),
-                    'mixed_layer_depth': float(profile_data.get('mixed_layer_depth', 0))
-                }],
-                ids=[profile_id]
+                embeddings=embeddings.tolist(),
+                documents=summaries,
+                metadatas=metadatas,
+                ids=ids
             )
             
-            return True
+            return positions
             
         except Exception as e:
-            logger.error(f"Error adding profile to vector DB: {e}")
-            return False
+            logger.error(f"Error adding profiles to vector DB: {e}")
+            return []
     
     def semantic_search(self, query: str, n_results: int = 10) -> Dict:
         """Perform semantic search on ARGO profiles"""
         try:
-            query_embedding = self.embedding_model.encode(query)
+            # Encoded the same way as stored summaries so both sides are unit vectors
+            query_embedding = self.embedding_model.encode(
+                query, convert_to_numpy=True, normalize_embeddings=True
+            )
             
             results = self.collection.query(
                 query_embeddings=[query_embedding.tolist()],
@@ -99,13 +167,17 @@ class ArgoVectorDatabase:
             logger.error(f"Error in semantic search: {e}")
             return {'documents': [[]], 'metadatas': [[]], 'ids': [[]]}
     
+    async def asemantic_search(self, query: str, n_results: int = 10) -> Dict:
+        """Run semantic_search in a worker thread so async callers aren't blocked"""
+        return await asyncio.to_thread(self.semantic_search, query, n_results)
+    
     def get_collection_stats(self) -> Dict:
         """Get statistics about the vector database collection"""
         try:
             count = self.collection.count()
             return {
                 'total_profiles': count,
-                'embedding_model': 'all-MiniLM-L6-v2',
+                'embedding_model': EMBEDDING_MODEL,
                 'vector_dimension': 384
             }
         except Exception as e:
@@ -1,17 +1,38 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from ..config import settings
+from typing import Dict, Iterator, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT / per batched UPDATE round trip on PostgreSQL
+EXECUTEMANY_PAGE_SIZE = 10_000
+
+def _engine_kwargs(url: str) -> Dict:
+    """Pool and executemany options for the configured backend"""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        # SQLite shares one connection across threads
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    
+    workers = os.cpu_count() or 1
+    kwargs = {
+        "pool_size": workers,
+        "max_overflow": 2 * workers,
+        "insertmanyvalues_page_size": EXECUTEMANY_PAGE_SIZE
+    }
+    if url.get_driver_name() == "psycopg2":
+        # executemany() of UPDATE/DELETE goes through psycopg2.extras.execute_batch
+        kwargs["executemany_mode"] = "values_plus_batch"
+        kwargs["executemany_batch_page_size"] = EXECUTEMANY_PAGE_SIZE
+    return kwargs
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -43,6 +64,32 @@ class DatabaseClient:
             logger.error(f"Error executing query: {e}")
             return []
     
+    def stream_query(self, query: str) -> Iterator[Dict]:
+        """Execute SQL query on a server-side cursor
+        
+        Rows are fetched lazily as the returned iterator is consumed; the
+        connection stays open until it is exhausted or discarded.
+        """
+        connection = self.engine.connect()
+        try:
+            result = connection.execution_options(stream_results=True).execute(text(query))
+            columns = list(result.keys())
+        except Exception as e:
+            connection.close()
+            logger.error(f"Error executing query: {e}")
+            return iter(())
+        
+        return self._iter_rows(connection, result, columns)
+    
+    @staticmethod
+    def _iter_rows(connection, result, columns: List[str]) -> Iterator[Dict]:
+        """Yield rows as dicts, closing the connection when done"""
+        try:
+            for row in result:
+                yield dict(zip(columns, row))
+        finally:
+            connection.close()
+    
     def get_connection(self):
         """Get database connection"""
         return self.engine.connect()
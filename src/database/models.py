@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, REAL, DateTime, JSON, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
@@ -16,10 +16,10 @@ class ArgoProfile(Base):
     longitude = Column(Float, nullable=False, index=True)
     measurement_date = Column(DateTime, nullable=False, index=True)
     
-    # Arrays for depth-dependent measurements
-    pressure_levels = Column(ARRAY(Float), nullable=False)
-    temperature = Column(ARRAY(Float), nullable=False)
-    salinity = Column(ARRAY(Float), nullable=False)
+    # Arrays for depth-dependent measurements, float32 (sensor precision) on disk
+    pressure_levels = Column(ARRAY(REAL), nullable=False)
+    temperature = Column(ARRAY(REAL), nullable=False)
+    salinity = Column(ARRAY(REAL), nullable=False)
     
     # Quality flags
     temp_qc = Column(ARRAY(Integer))
@@ -34,6 +34,19 @@ class ArgoProfile(Base):
     data_source = Column(String(100))
     processing_date = Column(DateTime, default=func.now())
     profile_metadata = Column(JSON)
+    
+    # Content hash of the source NetCDF file, used to skip re-ingesting it
+    file_hash = Column(String(32), unique=True, index=True)
+    
+    __table_args__ = (
+        # One row per float cycle; re-ingesting a file is a no-op
+        UniqueConstraint("platform_number", "cycle_number", name="uq_plat_cyc"),
+        # Serves the newest-first duplicate scan per (platform, cycle)
+        Index(
+            "ix_argo_profiles_platform_cycle_date",
+            "platform_number", "cycle_number", measurement_date.desc()
+        ),
+    )
 
 class ArgoBGCProfile(Base):
     __tablename__ = "argo_bgc_profiles"
@@ -42,11 +55,11 @@ class ArgoBGCProfile(Base):
     profile_id = Column(UUID(as_uuid=True), nullable=False)
     
     # BGC parameters
-    oxygen = Column(ARRAY(Float))
-    nitrate = Column(ARRAY(Float))
-    ph = Column(ARRAY(Float))
-    chlorophyll_a = Column(ARRAY(Float))
-    backscattering = Column(ARRAY(Float))
+    oxygen = Column(ARRAY(REAL))
+    nitrate = Column(ARRAY(REAL))
+    ph = Column(ARRAY(REAL))
+    chlorophyll_a = Column(ARRAY(REAL))
+    backscattering = Column(ARRAY(REAL))
     
     # Quality flags
     oxygen_qc = Column(ARRAY(Integer))
@@ -1,10 +1,10 @@
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime, timedelta
 
@@ -16,8 +16,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS and header markup. These are plain literals, re-evaluated on each
+# script run; the gain is that st.html sends them raw with no markdown parsing
+_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -46,11 +47,375 @@ st.markdown("""
         border: 1px solid #e0e0e0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = '<h1 class="main-header">🌊 FloatChat - AI Ocean Data Explorer</h1>'
+
+st.html(_CSS)
+
+@st.cache_resource
+def _rng() -> np.random.Generator:
+    """Shared generator for unseeded demo noise, kept across reruns and sessions"""
+    # Cached so a rerun continues the stream instead of reseeding it
+    return np.random.default_rng(42)
+
+# Example queries with their widget keys, built once per script run instead of
+# once per render of the chat interface fragment
+_EXAMPLES = tuple(
+    (example, f"example_{hash(example)}")
+    for example in (
+        "Show me temperature profiles near Chennai",
+        "What's the salinity in Arabian Sea last month?",
+        "Compare oxygen levels during monsoon seasons",
+        "Find ARGO floats near 15°N, 75°E",
+        "How has Bay of Bengal temperature changed?"
+    )
+)
+
+@st.cache_resource
+def get_api_session(base_url: str) -> requests.Session:
+    """Shared HTTP session per backend so keep-alive connections survive reruns"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount(base_url, adapter)
+    return session
+
+# Series longer than this are downsampled to DOWNSAMPLE_TARGET points before plotting
+DOWNSAMPLE_THRESHOLD = 3000
+DOWNSAMPLE_TARGET = 2000
+
+def _lttb(x: np.ndarray, y: np.ndarray, target: int = DOWNSAMPLE_TARGET) -> np.ndarray:
+    """Indices of a Largest-Triangle-Three-Buckets downsample of (x, y) to target points"""
+    n = len(y)
+    if n <= target or target < 3:
+        return np.arange(n)
+    
+    # Interior points split into target - 2 buckets; the end points are always kept
+    edges = np.linspace(1, n - 1, target - 1).astype(np.intp)
+    indices = np.empty(target, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(target - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and
+        # the next bucket's centroid
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    
+    return indices
+
+def _screen_indices(y: np.ndarray) -> np.ndarray:
+    """Indices to plot for a series, downsampling only when it exceeds the threshold"""
+    if len(y) <= DOWNSAMPLE_THRESHOLD:
+        return np.arange(len(y))
+    return _lttb(np.arange(len(y), dtype=np.float64), np.asarray(y, dtype=np.float64))
+
+def _seasonal(n: int, period: float, phase: float = 0.0) -> np.ndarray:
+    """Seasonal cycle sin(2*pi*t/period + phase) for t = 0..n-1"""
+    return np.sin(2 * np.pi * np.arange(n) / period + phase)
+
+def _profiles(depths: np.ndarray, params) -> np.ndarray:
+    """Rows of a*exp(-depth/scale) + offset + N(0, sigma), one per (a, scale, offset, sigma)"""
+    params = np.asarray(params, dtype=np.float64)
+    a, scale, offset, sigma = (params[:, k, None] for k in range(4))
+    profiles = np.exp(-depths[None, :] / scale)
+    profiles *= a
+    profiles += offset
+    profiles += _rng().normal(0, sigma, (len(params), len(depths)))
+    return profiles
+
+# Demo data and figures do not depend on widget state, so reruns reuse them
+@st.cache_data(ttl="1h", max_entries=8)
+def _build_float_df(seed: int, n: int) -> pd.DataFrame:
+    """Sample ARGO float positions and surface readings for the global map"""
+    # Create sample data for map
+    rng = np.random.default_rng(seed)
+    n_floats = n
+    
+    # Focus on Indian Ocean
+    lats = rng.normal(10, 15, n_floats)
+    lons = rng.normal(75, 20, n_floats)
+    
+    # Clip to reasonable bounds
+    lats = np.clip(lats, -60, 60)
+    lons = np.clip(lons, 30, 120)
+    
+    # Generate sample data
+    temps = rng.normal(26, 3, n_floats)
+    salinities = rng.normal(34.8, 0.5, n_floats)
+    depths = rng.uniform(500, 2000, n_floats)
+    
+    df = pd.DataFrame({
+        'latitude': lats,
+        'longitude': lons,
+        'temperature': temps,
+        'salinity': salinities,
+        'max_depth': depths,
+        'platform_number': np.char.add('290', np.char.zfill(np.arange(n_floats).astype(str), 4))
+    })
+    
+    return df
+
+@st.cache_data(ttl="1h", max_entries=8)
+def _build_float_figure(seed: int, n: int) -> go.Figure:
+    """Global float map coloured by surface temperature"""
+    df = _build_float_df(seed, n)
+    
+    # Create interactive map from the columns directly, skipping Plotly Express's
+    # DataFrame introspection. float32 arrays go to the browser as compact typed arrays
+    depths = df['max_depth'].to_numpy(np.float32)
+    fig = go.Figure(go.Scattermapbox(
+        lat=df['latitude'].to_numpy(np.float32),
+        lon=df['longitude'].to_numpy(np.float32),
+        mode='markers',
+        marker=dict(
+            size=depths,
+            sizemode='area',
+            sizeref=2 * depths.max() / 15 ** 2,
+            color=df['temperature'].to_numpy(np.float32),
+            colorscale='Viridis',
+            showscale=True,
+            colorbar=dict(title='temperature')
+        ),
+        text=df['platform_number'].to_numpy(),
+        customdata=df[['temperature', 'salinity', 'max_depth']].to_numpy(np.float32),
+        hovertemplate=(
+            "<b>%{text}</b><br>"
+            "temperature=%{customdata[0]:.1f}<br>"
+            "salinity=%{customdata[1]:.2f}<br>"
+            "max_depth=%{customdata[2]:.0f}<extra></extra>"
+        )
+    ))
+    
+    fig.update_layout(
+        title="ARGO Floats - Colored by Surface Temperature",
+        mapbox=dict(
+            style="open-street-map",
+            zoom=3,
+            center=dict(lat=df['latitude'].mean(), lon=df['longitude'].mean())
+        ),
+        height=600,
+        margin={"r":0,"t":50,"l":0,"b":0}
+    )
+    
+    return fig
+
+@st.cache_data(ttl="1h", max_entries=8)
+def _profile_comparison_figure() -> go.Figure:
+    """Arabian Sea vs Bay of Bengal temperature and salinity profiles"""
+    # Generate sample profile data (float32 keeps the serialized traces compact)
+    depths = np.linspace(0, 2000, 50, dtype=np.float32)
+    
+    # Temperature profiles for both basins in one batch: Arabian Sea, Bay of Bengal
+    temp1, temp2 = _profiles(depths, [(28, 800, 3, 0.3), (29, 900, 2.5, 0.3)]).astype(np.float32)
+    
+    # Salinity profile 1 - Arabian Sea
+    sal1 = (35.2 + 0.3 * (depths/1000) + _rng().normal(0, 0.05, len(depths))).astype(np.float32)
+    
+    # Salinity profile 2 - Bay of Bengal
+    sal2 = (34.0 + 0.8 * (depths/1000) + _rng().normal(0, 0.05, len(depths))).astype(np.float32)
+    
+    # Create comparison plot
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=("Temperature Comparison", "Salinity Comparison"),
+        shared_yaxes=True
+    )
+    
+    # Temperature profiles
+    fig.add_trace(
+        go.Scatter(x=temp1, y=depths, name="Arabian Sea", line=dict(color='red')),
+        row=1, col=1
+    )
+    fig.add_trace(
+        go.Scatter(x=temp2, y=depths, name="Bay of Bengal", line=dict(color='orange')),
+        row=1, col=1
+    )
+    
+    # Salinity profiles
+    fig.add_trace(
+        go.Scatter(x=sal1, y=depths, name="Arabian Sea", line=dict(color='blue'), showlegend=False),
+        row=1, col=2
+    )
+    fig.add_trace(
+        go.Scatter(x=sal2, y=depths, name="Bay of Bengal", line=dict(color='cyan'), showlegend=False),
+        row=1, col=2
+    )
+    
+    fig.update_yaxes(autorange="reversed", title="Depth (m)")
+    fig.update_xaxes(title="Temperature (°C)", row=1, col=1)
+    fig.update_xaxes(title="Salinity (PSU)", row=1, col=2)
+    fig.update_layout(height=500)
+    
+    return fig
+
+@st.cache_data(ttl="1h", max_entries=8)
+def _time_series_figure() -> go.Figure:
+    """Monthly surface temperature and salinity trends"""
+    # Generate sample time series data
+    dates = pd.date_range('2020-01-01', '2023-12-31', freq='M')
+    surface_temp = 26 + 2 * _seasonal(len(dates), 12) + _rng().normal(0, 0.5, len(dates))
+    surface_sal = 34.5 + 0.3 * _seasonal(len(dates), 12, np.pi/4) + _rng().normal(0, 0.1, len(dates))
+    
+    df_ts = pd.DataFrame({
+        'Date': dates,
+        'Surface_Temperature': surface_temp,
+        'Surface_Salinity': surface_sal
+    })
+    
+    # Create time series plot
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=("Surface Temperature Trend", "Surface Salinity Trend"),
+        shared_xaxes=True
+    )
+    
+    temp_idx = _screen_indices(surface_temp)
+    fig.add_trace(
+        go.Scatter(x=df_ts['Date'].values[temp_idx], y=surface_temp[temp_idx],
+                  mode='lines+markers', name='Temperature', line=dict(color='red')),
+        row=1, col=1
+    )
+    
+    sal_idx = _screen_indices(surface_sal)
+    fig.add_trace(
+        go.Scatter(x=df_ts['Date'].values[sal_idx], y=surface_sal[sal_idx],
+                  mode='lines+markers', name='Salinity', line=dict(color='blue')),
+        row=2, col=1
+    )
+    
+    fig.update_yaxes(title="Temperature (°C)", row=1, col=1)
+    fig.update_yaxes(title="Salinity (PSU)", row=2, col=1)
+    fig.update_xaxes(title="Date", row=2, col=1)
+    fig.update_layout(height=600)
+    
+    return fig
+
+@st.cache_data(ttl="1h", max_entries=8)
+def _regional_statistics():
+    """Regional statistics table and comparison figure"""
+    # Sample regional data
+    regions = ['Arabian Sea', 'Bay of Bengal', 'South Indian Ocean', 'Equatorial Indian Ocean']
+    avg_temp = [27.5, 28.2, 22.1, 27.8]
+    avg_sal = [35.8, 33.2, 34.9, 34.5]
+    profile_count = [245, 312, 189, 278]
+    
+    df_regional = pd.DataFrame({
+        'Region': regions,
+        'Avg_Temperature': avg_temp,
+        'Avg_Salinity': avg_sal,
+        'Profile_Count': profile_count
+    })
+    
+    # Create regional comparison
+    fig = make_subplots(
+        rows=1, cols=3,
+        subplot_titles=("Average Temperature", "Average Salinity", "Profile Count")
+    )
+    
+    fig.add_trace(
+        go.Bar(x=df_regional['Region'], y=df_regional['Avg_Temperature'], 
+               name='Temperature', marker_color='red'),
+        row=1, col=1
+    )
+    
+    fig.add_trace(
+        go.Bar(x=df_regional['Region'], y=df_regional['Avg_Salinity'], 
+               name='Salinity', marker_color='blue'),
+        row=1, col=2
+    )
+    
+    fig.add_trace(
+        go.Bar(x=df_regional['Region'], y=df_regional['Profile_Count'], 
+               name='Count', marker_color='green'),
+        row=1, col=3
+    )
+    
+    fig.update_yaxes(title="Temperature (°C)", row=1, col=1)
+    fig.update_yaxes(title="Salinity (PSU)", row=1, col=2)
+    fig.update_yaxes(title="Profile Count", row=1, col=3)
+    fig.update_layout(height=400, showlegend=False)
+    
+    return df_regional, fig
+
+@st.cache_data(ttl="1h", max_entries=8)
+def _anomaly_detection(year: int = 2023, threshold_k: float = 2.0):
+    """Daily temperature series with threshold anomalies, plus summary stats"""
+    # Generate sample anomaly data; a local generator keeps the global RNG untouched
+    rng = np.random.default_rng(42)
+    dates = pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='D')
+    normal_temp = 26 + 2 * _seasonal(len(dates), 365) + rng.normal(0, 0.3, len(dates))
+    
+    # Add some anomalies
+    anomaly_indices = rng.choice(len(dates), 20, replace=False)
+    normal_temp[anomaly_indices] += rng.normal(0, 2, len(anomaly_indices))
+    
+    # Detect anomalies (simple threshold method); one deviation array serves the
+    # mask and the summary
+    mean_temp = np.mean(normal_temp)
+    threshold = threshold_k * np.std(normal_temp)
+    abs_dev = np.abs(normal_temp - mean_temp)
+    anomalies = abs_dev > threshold
+    anom_idx = np.flatnonzero(anomalies)
+    norm_idx = np.flatnonzero(~anomalies)
+    
+    # Long series keep every anomaly but only a screen's worth of normal points
+    norm_idx = norm_idx[_screen_indices(normal_temp[norm_idx])]
+    
+    # Create anomaly plot
+    fig = go.Figure()
+    
+    # Normal data
+    fig.add_trace(go.Scatter(
+        x=dates.values[norm_idx],
+        y=normal_temp[norm_idx],
+        mode='markers',
+        name='Normal',
+        marker=dict(color='blue', size=4)
+    ))
+    
+    # Anomalies
+    fig.add_trace(go.Scatter(
+        x=dates.values[anom_idx],
+        y=normal_temp[anom_idx],
+        mode='markers',
+        name='Anomalies',
+        marker=dict(color='red', size=8, symbol='star')
+    ))
+    
+    # Add threshold lines
+    fig.add_hline(y=mean_temp + threshold, line_dash="dash", line_color="red", 
+                 annotation_text="Upper Threshold")
+    fig.add_hline(y=mean_temp - threshold, line_dash="dash", line_color="red", 
+                 annotation_text="Lower Threshold")
+    
+    fig.update_layout(
+        title=f"Temperature Anomaly Detection - Indian Ocean {year}",
+        xaxis_title="Date",
+        yaxis_title="Temperature (°C)",
+        height=500
+    )
+    
+    n_anomalies = len(anom_idx)
+    stats = {
+        'count': n_anomalies,
+        'rate': 100 * n_anomalies / len(dates),
+        'max_deviation': float(abs_dev.max())
+    }
+    return fig, stats
 
 class FloatChatApp:
     def __init__(self):
         self.api_base_url = "http://localhost:8000/api/v1"
+        self.session = get_api_session(self.api_base_url)
         self.initialize_session_state()
     
     def initialize_session_state(self):
@@ -68,7 +433,7 @@ class FloatChatApp:
     
     def render_header(self):
         """Render main header and navigation"""
-        st.markdown('<h1 class="main-header">🌊 FloatChat - AI Ocean Data Explorer</h1>', unsafe_allow_html=True)
+        st.html(_HEADER_HTML)
         st.markdown("*Discover ocean insights through natural language conversations*")
         
         # Mode selector
@@ -191,62 +556,13 @@ class FloatChatApp:
         with tab3:
             self.render_data_analysis()
     
+    @st.fragment
     def render_global_view(self):
         """Render global map view"""
         st.subheader("🗺️ Global ARGO Float Distribution")
         
-        # Create sample data for map
-        np.random.seed(42)
-        n_floats = 100
-        
-        # Focus on Indian Ocean
-        lats = np.random.normal(10, 15, n_floats)
-        lons = np.random.normal(75, 20, n_floats)
-        
-        # Clip to reasonable bounds
-        lats = np.clip(lats, -60, 60)
-        lons = np.clip(lons, 30, 120)
-        
-        # Generate sample data
-        temps = np.random.normal(26, 3, n_floats)
-        salinities = np.random.normal(34.8, 0.5, n_floats)
-        depths = np.random.uniform(500, 2000, n_floats)
-        
-        df = pd.DataFrame({
-            'latitude': lats,
-            'longitude': lons,
-            'temperature': temps,
-            'salinity': salinities,
-            'max_depth': depths,
-            'platform_number': [f"290{i:04d}" for i in range(n_floats)]
-        })
-        
-        # Create interactive map
-        fig = px.scatter_mapbox(
-            df,
-            lat='latitude',
-            lon='longitude',
-            color='temperature',
-            size='max_depth',
-            hover_name='platform_number',
-            hover_data={
-                'temperature': ':.1f',
-                'salinity': ':.2f',
-                'max_depth': ':.0f'
-            },
-            color_continuous_scale='Viridis',
-            size_max=15,
-            zoom=3,
-            title="ARGO Floats - Colored by Surface Temperature"
-        )
-        
-        fig.update_layout(
-            mapbox_style="open-street-map",
-            height=600,
-            margin={"r":0,"t":50,"l":0,"b":0}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        df = _build_float_df(42, 100)
+        st.plotly_chart(_build_float_figure(42, 100), use_container_width=True)
         
         # Statistics below map
         col1, col2, col3, col4 = st.columns(4)
@@ -260,50 +576,59 @@ class FloatChatApp:
         with col4:
             st.metric("Avg Depth", f"{df['max_depth'].mean():.0f}m")
     
+    @st.fragment
     def render_chat_interface(self):
         """Render chat interface"""
         st.subheader("💬 Ask FloatChat")
         
         # Example queries
         with st.expander("💡 Try these example queries"):
-            examples = [
-                "Show me temperature profiles near Chennai",
-                "What's the salinity in Arabian Sea last month?",
-                "Compare oxygen levels during monsoon seasons",
-                "Find ARGO floats near 15°N, 75°E",
-                "How has Bay of Bengal temperature changed?"
-            ]
-            
-            for example in examples:
-                if st.button(example, key=f"example_{hash(example)}"):
-                    self.process_chat_message(example)
+            # Clicking only queues the prompt; it is handled with the chat input below
+            for example, key in _EXAMPLES:
+                st.button(
+                    example,
+                    key=key,
+                    on_click=st.session_state.__setitem__,
+                    args=("pending_prompt", example)
+                )
         
         # Chat history
         st.markdown('<div class="chat-container">', unsafe_allow_html=True)
         
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-                
-                if "visualization" in message:
-                    st.plotly_chart(message["visualization"])
-                
-                if "data" in message:
-                    st.dataframe(message["data"])
+        # New turns are written into this container too, so they land above the
+        # input box; figures are built once per message and stable keys let
+        # Streamlit match each chart to its existing element across reruns
+        history = st.container()
+        with history:
+            for i, message in enumerate(st.session_state.messages):
+                self.render_message(message, i)
         
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Chat input
-        if prompt := st.chat_input("Ask me about ocean data..."):
-            self.process_chat_message(prompt)
+        prompt = st.chat_input("Ask me about ocean data...") or st.session_state.pop("pending_prompt", None)
+        if prompt:
+            self.process_chat_message(prompt, history)
     
-    def process_chat_message(self, message: str):
+    def render_message(self, message: dict, index: int):
+        """Render one chat message with its optional chart and table"""
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+            
+            if "visualization" in message:
+                st.plotly_chart(message["visualization"], key=f"chat_viz_{index}")
+            
+            if "data" in message:
+                st.dataframe(message["data"])
+    
+    def process_chat_message(self, message: str, history):
         """Process chat message and generate response"""
         # Add user message
-        st.session_state.messages.append({
+        user_message = {
             "role": "user",
             "content": message
-        })
+        }
+        st.session_state.messages.append(user_message)
         
         # Generate mock response based on keywords
         response_text, visualization, data = self.generate_mock_response(message)
@@ -322,8 +647,12 @@ class FloatChatApp:
         
         st.session_state.messages.append(assistant_message)
         
-        # Rerun to update chat
-        st.rerun()
+        # Write the new turn in place instead of rerunning; the next rerun renders
+        # it from history under the same keys
+        n = len(st.session_state.messages)
+        with history:
+            self.render_message(user_message, n - 2)
+            self.render_message(assistant_message, n - 1)
     
     def generate_mock_response(self, query: str):
         """Generate mock response based on query keywords"""
@@ -333,7 +662,7 @@ class FloatChatApp:
         if 'temperature' in query_lower or 'temp' in query_lower:
             # Generate sample temperature profile
             depths = np.linspace(0, 2000, 50)
-            temps = 28 * np.exp(-depths/1000) + 2 + np.random.normal(0, 0.5, len(depths))
+            temps = _profiles(depths, [(28, 1000, 2, 0.5)])[0]
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
@@ -359,7 +688,7 @@ class FloatChatApp:
         elif 'salinity' in query_lower or 'salt' in query_lower:
             # Generate sample salinity profile
             depths = np.linspace(0, 2000, 50)
-            salinity = 34.5 + 0.5 * (depths/1000) + np.random.normal(0, 0.1, len(depths))
+            salinity = 34.5 + 0.5 * (depths/1000) + _rng().normal(0, 0.1, len(depths))
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
@@ -420,202 +749,38 @@ class FloatChatApp:
         elif analysis_type == "Anomaly Detection":
             self.render_anomaly_detection()
     
+    @st.fragment
     def render_profile_comparison(self):
         """Render profile comparison visualization"""
         st.write("Compare temperature and salinity profiles from different floats or regions")
         
-        # Generate sample profile data
-        depths = np.linspace(0, 2000, 50)
-        
-        # Profile 1 - Arabian Sea
-        temp1 = 28 * np.exp(-depths/800) + 3 + np.random.normal(0, 0.3, len(depths))
-        sal1 = 35.2 + 0.3 * (depths/1000) + np.random.normal(0, 0.05, len(depths))
-        
-        # Profile 2 - Bay of Bengal
-        temp2 = 29 * np.exp(-depths/900) + 2.5 + np.random.normal(0, 0.3, len(depths))
-        sal2 = 34.0 + 0.8 * (depths/1000) + np.random.normal(0, 0.05, len(depths))
-        
-        # Create comparison plot
-        fig = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=("Temperature Comparison", "Salinity Comparison"),
-            shared_yaxes=True
-        )
-        
-        # Temperature profiles
-        fig.add_trace(
-            go.Scatter(x=temp1, y=depths, name="Arabian Sea", line=dict(color='red')),
-            row=1, col=1
-        )
-        fig.add_trace(
-            go.Scatter(x=temp2, y=depths, name="Bay of Bengal", line=dict(color='orange')),
-            row=1, col=1
-        )
-        
-        # Salinity profiles
-        fig.add_trace(
-            go.Scatter(x=sal1, y=depths, name="Arabian Sea", line=dict(color='blue'), showlegend=False),
-            row=1, col=2
-        )
-        fig.add_trace(
-            go.Scatter(x=sal2, y=depths, name="Bay of Bengal", line=dict(color='cyan'), showlegend=False),
-            row=1, col=2
-        )
-        
-        fig.update_yaxes(autorange="reversed", title="Depth (m)")
-        fig.update_xaxes(title="Temperature (°C)", row=1, col=1)
-        fig.update_xaxes(title="Salinity (PSU)", row=1, col=2)
-        fig.update_layout(height=500)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_profile_comparison_figure(), use_container_width=True)
     
+    @st.fragment
     def render_time_series_analysis(self):
         """Render time series analysis"""
         st.write("Analyze temporal trends in ocean parameters")
         
-        # Generate sample time series data
-        dates = pd.date_range('2020-01-01', '2023-12-31', freq='M')
-        surface_temp = 26 + 2 * np.sin(2 * np.pi * np.arange(len(dates)) / 12) + np.random.normal(0, 0.5, len(dates))
-        surface_sal = 34.5 + 0.3 * np.sin(2 * np.pi * np.arange(len(dates)) / 12 + np.pi/4) + np.random.normal(0, 0.1, len(dates))
-        
-        df_ts = pd.DataFrame({
-            'Date': dates,
-            'Surface_Temperature': surface_temp,
-            'Surface_Salinity': surface_sal
-        })
-        
-        # Create time series plot
-        fig = make_subplots(
-            rows=2, cols=1,
-            subplot_titles=("Surface Temperature Trend", "Surface Salinity Trend"),
-            shared_xaxes=True
-        )
-        
-        fig.add_trace(
-            go.Scatter(x=df_ts['Date'], y=df_ts['Surface_Temperature'], 
-                      mode='lines+markers', name='Temperature', line=dict(color='red')),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(x=df_ts['Date'], y=df_ts['Surface_Salinity'], 
-                      mode='lines+markers', name='Salinity', line=dict(color='blue')),
-            row=2, col=1
-        )
-        
-        fig.update_yaxes(title="Temperature (°C)", row=1, col=1)
-        fig.update_yaxes(title="Salinity (PSU)", row=2, col=1)
-        fig.update_xaxes(title="Date", row=2, col=1)
-        fig.update_layout(height=600)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_time_series_figure(), use_container_width=True)
     
+    @st.fragment
     def render_regional_statistics(self):
         """Render regional statistics"""
         st.write("Compare statistics across different ocean regions")
         
-        # Sample regional data
-        regions = ['Arabian Sea', 'Bay of Bengal', 'South Indian Ocean', 'Equatorial Indian Ocean']
-        avg_temp = [27.5, 28.2, 22.1, 27.8]
-        avg_sal = [35.8, 33.2, 34.9, 34.5]
-        profile_count = [245, 312, 189, 278]
-        
-        df_regional = pd.DataFrame({
-            'Region': regions,
-            'Avg_Temperature': avg_temp,
-            'Avg_Salinity': avg_sal,
-            'Profile_Count': profile_count
-        })
-        
-        # Create regional comparison
-        fig = make_subplots(
-            rows=1, cols=3,
-            subplot_titles=("Average Temperature", "Average Salinity", "Profile Count")
-        )
-        
-        fig.add_trace(
-            go.Bar(x=df_regional['Region'], y=df_regional['Avg_Temperature'], 
-                   name='Temperature', marker_color='red'),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Bar(x=df_regional['Region'], y=df_regional['Avg_Salinity'], 
-                   name='Salinity', marker_color='blue'),
-            row=1, col=2
-        )
-        
-        fig.add_trace(
-            go.Bar(x=df_regional['Region'], y=df_regional['Profile_Count'], 
-                   name='Count', marker_color='green'),
-            row=1, col=3
-        )
-        
-        fig.update_yaxes(title="Temperature (°C)", row=1, col=1)
-        fig.update_yaxes(title="Salinity (PSU)", row=1, col=2)
-        fig.update_yaxes(title="Profile Count", row=1, col=3)
-        fig.update_layout(height=400, showlegend=False)
-        
+        df_regional, fig = _regional_statistics()
         st.plotly_chart(fig, use_container_width=True)
         
         # Display data table
         st.subheader("Regional Statistics Table")
         st.dataframe(df_regional, use_container_width=True)
     
+    @st.fragment
     def render_anomaly_detection(self):
         """Render anomaly detection visualization"""
         st.write("Detect and visualize oceanographic anomalies")
         
-        # Generate sample anomaly data
-        np.random.seed(42)
-        dates = pd.date_range('2023-01-01', '2023-12-31', freq='D')
-        normal_temp = 26 + 2 * np.sin(2 * np.pi * np.arange(len(dates)) / 365) + np.random.normal(0, 0.3, len(dates))
-        
-        # Add some anomalies
-        anomaly_indices = np.random.choice(len(dates), 20, replace=False)
-        normal_temp[anomaly_indices] += np.random.normal(0, 2, len(anomaly_indices))
-        
-        # Detect anomalies (simple threshold method)
-        mean_temp = np.mean(normal_temp)
-        std_temp = np.std(normal_temp)
-        threshold = 2 * std_temp
-        
-        anomalies = np.abs(normal_temp - mean_temp) > threshold
-        
-        # Create anomaly plot
-        fig = go.Figure()
-        
-        # Normal data
-        fig.add_trace(go.Scatter(
-            x=dates[~anomalies], 
-            y=normal_temp[~anomalies],
-            mode='markers',
-            name='Normal',
-            marker=dict(color='blue', size=4)
-        ))
-        
-        # Anomalies
-        fig.add_trace(go.Scatter(
-            x=dates[anomalies], 
-            y=normal_temp[anomalies],
-            mode='markers',
-            name='Anomalies',
-            marker=dict(color='red', size=8, symbol='star')
-        ))
-        
-        # Add threshold lines
-        fig.add_hline(y=mean_temp + threshold, line_dash="dash", line_color="red", 
-                     annotation_text="Upper Threshold")
-        fig.add_hline(y=mean_temp - threshold, line_dash="dash", line_color="red", 
-                     annotation_text="Lower Threshold")
-        
-        fig.update_layout(
-            title="Temperature Anomaly Detection - Indian Ocean 2023",
-            xaxis_title="Date",
-            yaxis_title="Temperature (°C)",
-            height=500
-        )
-        
+        fig, stats = _anomaly_detection()
         st.plotly_chart(fig, use_container_width=True)
         
         # Anomaly summary
@@ -623,11 +788,11 @@ class FloatChatApp:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Anomalies", np.sum(anomalies))
+            st.metric("Total Anomalies", stats['count'])
         with col2:
-            st.metric("Anomaly Rate", f"{100*np.sum(anomalies)/len(dates):.1f}%")
+            st.metric("Anomaly Rate", f"{stats['rate']:.1f}%")
         with col3:
-            st.metric("Max Deviation", f"{np.max(np.abs(normal_temp - mean_temp)):.1f}°C")
+            st.metric("Max Deviation", f"{stats['max_deviation']:.1f}°C")
     
     def run(self):
         """Main application entry point"""
@@ -3,23 +3,74 @@
 Simple database test and setup script
 """
 
-import psycopg2
-from sqlalchemy import create_engine, text
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool
 import sys
 
 # Database connection parameters
 DB_CONFIG = {
     'host': 'localhost',
     'port': 5432,
-    'database': 'floatchat',
+    'dbname': 'floatchat',
     'user': 'floatchat',
     'password': 'floatchat123'
 }
 
+# Column order and PostgreSQL types used by bulk_insert_profiles
+PROFILE_COLUMNS = (
+    ('platform_number', 'varchar'),
+    ('cycle_number', 'int4'),
+    ('latitude', 'float8'),
+    ('longitude', 'float8'),
+    ('measurement_date', 'timestamp'),
+    ('temperature', 'float8[]'),
+    ('salinity', 'float8[]'),
+    ('pressure_levels', 'float8[]'),
+    ('mixed_layer_depth', 'float8'),
+    ('max_depth', 'float8'),
+    ('ocean_region', 'varchar'),
+)
+
+# Indexes for platform lookups, recent-first listings and date ranges, and regions
+PROFILE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_argo_platform_cycle ON argo_profiles (platform_number, cycle_number)",
+    "CREATE INDEX IF NOT EXISTS ix_argo_date ON argo_profiles (measurement_date DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_argo_region ON argo_profiles (ocean_region)",
+)
+
+# Spatial index; needs PostGIS, so it runs in its own transaction and is optional
+POSTGIS_INDEXES = (
+    "CREATE EXTENSION IF NOT EXISTS postgis",
+    "CREATE INDEX IF NOT EXISTS ix_argo_position ON argo_profiles "
+    "USING GIST ((ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)))",
+)
+
+_pool = None
+
+def get_pool() -> ConnectionPool:
+    """Return the shared connection pool, opening it on first use"""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(make_conninfo(**DB_CONFIG), min_size=1, max_size=5, open=True)
+    return _pool
+
+def bulk_insert_profiles(records: list) -> int:
+    """Load profile dicts into argo_profiles with one binary COPY, returning the row count"""
+    columns = ", ".join(name for name, _ in PROFILE_COLUMNS)
+    with get_pool().connection() as conn, conn.cursor() as cursor:
+        with cursor.copy(f"COPY argo_profiles ({columns}) FROM STDIN WITH (FORMAT BINARY)") as copy:
+            # Binary COPY needs explicit types; values are sent without text parsing
+            copy.set_types([pg_type for _, pg_type in PROFILE_COLUMNS])
+            for record in records:
+                copy.write_row([record.get(name) for name, _ in PROFILE_COLUMNS])
+    
+    return len(records)
+
 def test_connection():
     """Test database connection"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = psycopg.connect(**DB_CONFIG)
         print("✅ Database connection successful!")
         conn.close()
         return True
@@ -30,12 +81,9 @@ def test_connection():
 def create_tables():
     """Create basic tables"""
     try:
-        # Create SQLAlchemy engine
-        engine = create_engine(f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
-        
         # Create a simple test table
-        with engine.connect() as conn:
-            conn.execute(text("""
+        with get_pool().connection() as conn:
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS argo_profiles (
                     profile_id SERIAL PRIMARY KEY,
                     platform_number VARCHAR(20) NOT NULL,
@@ -50,10 +98,19 @@ def create_tables():
                     max_depth FLOAT,
                     ocean_region VARCHAR(50)
                 );
-            """))
-            conn.commit()
+            """)
+            for statement in PROFILE_INDEXES:
+                conn.execute(statement)
         
         print("✅ Database tables created successfully!")
+        
+        try:
+            with get_pool().connection() as conn:
+                for statement in POSTGIS_INDEXES:
+                    conn.execute(statement)
+        except Exception as e:
+            print(f"⚠️ Skipping spatial index (PostGIS unavailable): {e}")
+        
         return True
         
     except Exception as e:
@@ -0,0 +1,37 @@
+import unittest
+
+from src.ai.intent_classifier import IntentClassifier
+
+
+class TestEntityExtraction(unittest.TestCase):
+    """Locations, time periods and values pulled out of user queries"""
+    
+    def setUp(self):
+        self.classifier = IntentClassifier()
+    
+    def entities(self, query):
+        return self.classifier.classify_intent(query)['entities']
+    
+    def test_year_pair_is_not_a_coordinate(self):
+        entities = self.entities("salinity in 2022, 2023")
+        self.assertEqual(entities['time_periods'], ['2022', '2023'])
+        self.assertEqual(entities['locations'], [])
+    
+    def test_space_separated_years_are_not_a_coordinate(self):
+        entities = self.entities("Compare 2021 2022 temperatures")
+        self.assertEqual(entities['time_periods'], ['2021', '2022'])
+        self.assertEqual(entities['locations'], [])
+    
+    def test_marked_coordinates_are_a_location(self):
+        entities = self.entities("Find ARGO floats near 15°N, 75°E")
+        self.assertEqual(entities['locations'], ['15°N, 75°E'])
+        self.assertEqual(entities['values'], ['15', '75'])
+    
+    def test_hemisphere_letters_mark_a_location(self):
+        entities = self.entities("profiles at 12.5 n 80.25 e in 2023")
+        self.assertEqual(entities['locations'], ['12.5°N, 80.25°E'])
+        self.assertEqual(entities['time_periods'], ['2023'])
+
+
+if __name__ == '__main__':
+    unittest.main()